@@ -11,6 +11,11 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["article", "-created_at"], name="comment_article_created_idx"),
+        ]
+
     def __str__(self):
         return f"Comment by {self.user} on {self.article}"
 
@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models import F
+from news.models import Article
+from news.pagination import KeysetPaginator
+
+COMMENTS_PER_PAGE = 20
+
+
+# Article.comment_count is maintained here so listings never need a COUNT per card
+
+def save_new_comment(comment):
+    with transaction.atomic():
+        comment.save()
+        Article.objects.filter(pk=comment.article_id).update(comment_count=F("comment_count") + 1)
+    return comment
+
+
+def delete_comment(comment):
+    with transaction.atomic():
+        article_id = comment.article_id
+        comment.delete()
+        Article.objects.filter(pk=article_id, comment_count__gt=0).update(comment_count=F("comment_count") - 1)
+
+
+def get_comment_page(article, cursor=None):
+    # Newest first, one indexed range query per page (comment_article_created_idx)
+    from comments.models import Comment
+
+    comments = Comment.objects.filter(article=article).select_related("user").only(
+        "id", "article_id", "content", "created_at", "user__username"
+    )
+    return KeysetPaginator(comments, COMMENTS_PER_PAGE).get_page(cursor)
@@ -2,10 +2,18 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from .models import Comment
 from .forms import CommentForm
+from .utils import save_new_comment, delete_comment, get_comment_page
 from news.models import Article
 
 # Create your views here.
 
+def comment_page(request, article_id):
+    # Partial for "Load more comments" on article_detail
+    article = get_object_or_404(Article.objects.only("id", "slug"), pk=article_id, status="published")
+    comments = get_comment_page(article, request.GET.get("cursor"))
+    return render(request, "comments/_comment_page.html", {"article": article, "comments": comments})
+
+
 @login_required
 def comment_create(request, article_id):
     article = get_object_or_404(Article, id=article_id)
@@ -18,7 +26,7 @@ def comment_create(request, article_id):
             comment = form.save(commit=False)
             comment.user = request.user
             comment.article = article
-            comment.save()
+            save_new_comment(comment)
 
             return redirect("news:article_detail", slug=article.slug)
         
@@ -47,7 +55,7 @@ def comment_delete(request, pk):
     article_slug = comment.article.slug
 
     if request.method == "POST":
-        comment.delete()
+        delete_comment(comment)
 
         return redirect("news:article_detail", slug=article_slug)
     
@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     'news.apps.NewsConfig',
     'comments',
     'users',
+    'notifications',
 
     # Third-party apps
     "widget_tweaks",
@@ -93,6 +94,24 @@ DATABASES = {
 }
 
 
+# Cache
+# Fragment versions, cached pages and the trending sidebar are shared between the
+# web workers and the management commands (update_trending, send_outbox, ...), so
+# the cache must be shared too: per-process LocMem would leave each worker with
+# its own versions. The database cache needs no extra service; point
+# CACHE_BACKEND/CACHE_LOCATION at Redis or Memcached when one is available.
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': config('CACHE_LOCATION', default='django_cache'),
+    }
+}
+if CACHES['default']['BACKEND'].endswith('DatabaseCache'):
+    # The default of 300 entries would keep culling cached pages and fragments
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': 20000}
+
+
 # DATABASES = {
 #     "default": {
 #         "ENGINE": "django.db.backends.postgresql",
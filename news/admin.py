@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Article, Category
+from .models import Article, AuthorStats, Category
 
 # Register your models here
 
@@ -14,3 +14,10 @@ class ArticleAdmin(admin.ModelAdmin):
     list_filter = ("status", "category", "created_at")
     search_fields = ("title", "content")
     prepopulated_fields = {"slug": ("title",)} 
+
+
+@admin.register(AuthorStats)
+class AuthorStatsAdmin(admin.ModelAdmin):
+    list_display = ("author", "total", "pending", "published", "last_published_at")
+    search_fields = ("author__username",)
+    readonly_fields = ("author", "total", "pending", "published", "last_published_at")
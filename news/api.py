@@ -0,0 +1,180 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_GET
+from comments.models import Comment
+from news.models import Article, Category
+from news.pagination import KeysetPaginator
+
+
+# Read-only JSON API.
+# Each resource declares its fields as name -> (columns to load, related models to
+# join, getter). `fields=` picks a subset, which becomes the .only()/select_related()
+# of the query, and rows are serialised by calling the chosen getters directly.
+# Lists are cursor-paginated on (created_at, id); articles can also be fetched in
+# bulk with `slugs=a,b,c`. Every response carries an ETag of its body.
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_SLUGS = 100
+
+
+class APIError(Exception):
+    pass
+
+
+def _image_url(obj):
+    return obj.image.url if obj.image else None
+
+
+ARTICLE_FIELDS = {
+    "id": ((), (), lambda a: a.pk),
+    "slug": (("slug",), (), lambda a: a.slug),
+    "title": (("title",), (), lambda a: a.title),
+    "excerpt": (("excerpt",), (), lambda a: a.excerpt),
+    "content": (("content",), (), lambda a: a.content),
+    "url": (("slug",), (), lambda a: reverse("news:article_detail", args=[a.slug])),
+    "image": (("image",), (), _image_url),
+    "author": (("author", "author__username"), ("author",), lambda a: a.author.username),
+    "category": (("category", "category__name"), ("category",), lambda a: {"id": a.category_id, "name": a.category.name} if a.category_id else None),
+    "word_count": (("word_count",), (), lambda a: a.word_count),
+    "comment_count": (("comment_count",), (), lambda a: a.comment_count),
+    "view_count": (("view_count",), (), lambda a: a.view_count),
+    "created_at": (("created_at",), (), lambda a: a.created_at),
+    "updated_at": (("updated_at",), (), lambda a: a.updated_at),
+}
+ARTICLE_DEFAULT_FIELDS = ("id", "slug", "title", "excerpt", "url", "image", "author", "category", "comment_count", "created_at")
+
+CATEGORY_FIELDS = {
+    "id": ((), (), lambda c: c.pk),
+    "name": (("name",), (), lambda c: c.name),
+    "description": (("description",), (), lambda c: c.description),
+    "url": ((), (), lambda c: reverse("news:category_detail", args=[c.pk])),
+}
+CATEGORY_DEFAULT_FIELDS = ("id", "name", "url")
+
+COMMENT_FIELDS = {
+    "id": ((), (), lambda c: c.pk),
+    "content": (("content",), (), lambda c: c.content),
+    "user": (("user", "user__username"), ("user",), lambda c: c.user.username),
+    "created_at": (("created_at",), (), lambda c: c.created_at),
+    "updated_at": (("updated_at",), (), lambda c: c.updated_at),
+}
+COMMENT_DEFAULT_FIELDS = ("id", "content", "user", "created_at")
+
+
+def _select(request, spec, defaults):
+    requested = request.GET.get("fields")
+    names = [name.strip() for name in requested.split(",") if name.strip()] if requested else list(defaults)
+    unknown = [name for name in names if name not in spec]
+    if unknown:
+        raise APIError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(spec)}.")
+    return names
+
+
+def _shape(queryset, spec, names, key_columns=()):
+    columns, related = set(key_columns), set()
+    for name in names:
+        columns.update(spec[name][0])
+        related.update(spec[name][1])
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
+
+
+def _serializer(spec, names):
+    getters = [(name, spec[name][2]) for name in names]
+    return lambda obj: {name: get(obj) for name, get in getters}
+
+
+def _page_size(request):
+    try:
+        return min(max(int(request.GET.get("limit", PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        raise APIError("limit must be an integer.")
+
+
+def _paginated(request, queryset, serialize):
+    page = KeysetPaginator(queryset, _page_size(request)).get_page(request.GET.get("cursor"))
+    return {
+        "results": [serialize(obj) for obj in page],
+        "next": page.next_cursor or None,
+        "previous": page.previous_cursor or None,
+    }
+
+
+def _respond(request, payload):
+    body = json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":"))
+    etag = f'"{hashlib.md5(body.encode()).hexdigest()}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    return response
+
+
+def api_view(view):
+    view = require_GET(view)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except APIError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+
+    return wrapper
+
+
+@api_view
+def article_list_api(request):
+    names = _select(request, ARTICLE_FIELDS, ARTICLE_DEFAULT_FIELDS)
+    serialize = _serializer(ARTICLE_FIELDS, names)
+    articles = Article.objects.filter(status="published")
+
+    slugs = request.GET.get("slugs")
+    if slugs:
+        slugs = list(dict.fromkeys(slug for slug in slugs.split(",") if slug))
+        if len(slugs) > MAX_SLUGS:
+            raise APIError(f"At most {MAX_SLUGS} slugs per request.")
+        found = {a.slug: a for a in _shape(articles.filter(slug__in=slugs), ARTICLE_FIELDS, names, ("slug",))}
+        return _respond(request, {
+            "results": [serialize(found[slug]) for slug in slugs if slug in found],
+            "missing": [slug for slug in slugs if slug not in found],
+        })
+
+    category = request.GET.get("category")
+    if category:
+        if not category.isdigit():
+            raise APIError("category must be an id.")
+        articles = articles.filter(category_id=category)
+    return _respond(request, _paginated(request, _shape(articles, ARTICLE_FIELDS, names, ("created_at",)), serialize))
+
+
+@api_view
+def article_detail_api(request, slug):
+    names = _select(request, ARTICLE_FIELDS, ARTICLE_DEFAULT_FIELDS + ("content", "updated_at"))
+    article = get_object_or_404(_shape(Article.objects.filter(status="published"), ARTICLE_FIELDS, names), slug=slug)
+    return _respond(request, _serializer(ARTICLE_FIELDS, names)(article))
+
+
+@api_view
+def category_list_api(request):
+    names = _select(request, CATEGORY_FIELDS, CATEGORY_DEFAULT_FIELDS)
+    serialize = _serializer(CATEGORY_FIELDS, names)
+    categories = _shape(Category.objects.order_by("name"), CATEGORY_FIELDS, names)
+    return _respond(request, {"results": [serialize(c) for c in categories]})
+
+
+@api_view
+def comment_list_api(request, slug):
+    names = _select(request, COMMENT_FIELDS, COMMENT_DEFAULT_FIELDS)
+    article_id = get_object_or_404(Article.objects.filter(status="published").values_list("pk", flat=True), slug=slug)
+    comments = _shape(Comment.objects.filter(article_id=article_id), COMMENT_FIELDS, names, ("created_at",))
+    return _respond(request, _paginated(request, comments, _serializer(COMMENT_FIELDS, names)))
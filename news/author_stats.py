@@ -0,0 +1,120 @@
+import threading
+
+from django.db.models import Count, F, Max, Q, Value
+from django.db.models.functions import Coalesce, Greatest
+from news.models import Article, AuthorStats
+
+
+# Materialised per-author counters for the reporter dashboard.
+# Signals apply a delta for every article created, deleted or moved between
+# statuses; bulk paths (the importer, bulk moderation) collect deltas and apply
+# them once per author. `rebuild_author_stats` recomputes everything. The last
+# published time is always the article's published_at, in every path.
+
+STATUSES = ("pending", "published")
+
+
+def new_delta():
+    return {"total": 0, "pending": 0, "published": 0, "published_at": None}
+
+
+def add_to_delta(delta, status, n=1, published_at=None):
+    if status in STATUSES:
+        delta[status] += n
+    if published_at and (delta["published_at"] is None or published_at > delta["published_at"]):
+        delta["published_at"] = published_at
+
+
+def apply_deltas(deltas, create=True):
+    """Apply ``{author_id: delta}`` with one UPDATE per author.
+
+    Pass ``create=False`` for deltas that only remove articles: the author's row
+    must already exist, and inserting one could resurrect it mid-cascade.
+    """
+    deltas = {author_id: d for author_id, d in deltas.items() if any(d.values())}
+    if not deltas:
+        return
+    if create:
+        AuthorStats.objects.bulk_create([AuthorStats(author_id=pk) for pk in deltas], ignore_conflicts=True)
+    for author_id, delta in deltas.items():
+        updates = {
+            field: Greatest(F(field) + delta[field], Value(0))
+            for field in ("total", "pending", "published")
+            if delta[field]
+        }
+        if delta["published_at"]:
+            published_at = Value(delta["published_at"])
+            # GREATEST() is NULL on SQLite when either side is
+            updates["last_published_at"] = Coalesce(Greatest(F("last_published_at"), published_at), published_at)
+        AuthorStats.objects.filter(author_id=author_id).update(**updates)
+
+
+def record_created(article):
+    delta = new_delta()
+    delta["total"] = 1
+    add_to_delta(delta, article.status, published_at=article.published_at if article.status == "published" else None)
+    apply_deltas({article.author_id: delta})
+
+
+def record_status_change(article, previous):
+    delta = new_delta()
+    add_to_delta(delta, previous, -1)
+    add_to_delta(delta, article.status, published_at=article.published_at if article.status == "published" else None)
+    apply_deltas({article.author_id: delta})
+
+
+def record_author_change(article, previous_author_id, previous_status):
+    removed = new_delta()
+    removed["total"] = -1
+    add_to_delta(removed, previous_status, -1)
+    added = new_delta()
+    added["total"] = 1
+    add_to_delta(added, article.status, published_at=article.published_at if article.status == "published" else None)
+    apply_deltas({previous_author_id: removed}, create=False)
+    apply_deltas({article.author_id: added})
+
+
+def record_deleted(article, status):
+    # The author's own row goes with them, so their cascading articles are skipped
+    if article.author_id in authors_being_deleted():
+        return
+    delta = new_delta()
+    delta["total"] = -1
+    add_to_delta(delta, status, -1)
+    apply_deltas({article.author_id: delta}, create=False)
+
+
+_local = threading.local()
+
+
+def authors_being_deleted():
+    return getattr(_local, "deleting", set())
+
+
+def start_author_delete(author_id):
+    _local.deleting = authors_being_deleted() | {author_id}
+
+
+def finish_author_delete(author_id):
+    _local.deleting = authors_being_deleted() - {author_id}
+
+
+def rebuild_author_stats():
+    rows = (
+        Article.objects.order_by()
+        .values("author_id")
+        .annotate(
+            total=Count("id"),
+            pending=Count("id", filter=Q(status="pending")),
+            published=Count("id", filter=Q(status="published")),
+            last_published_at=Max("published_at", filter=Q(status="published")),
+        )
+    )
+    stats = [AuthorStats(author_id=row.pop("author_id"), **row) for row in rows]
+    AuthorStats.objects.all().delete()
+    AuthorStats.objects.bulk_create(stats, batch_size=1000)
+    return len(stats)
+
+
+def get_author_stats(author):
+    return AuthorStats.objects.filter(author=author).first() or AuthorStats(author=author)
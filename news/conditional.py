@@ -0,0 +1,130 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.db.models import OuterRef, Subquery
+from django.utils.cache import patch_cache_control
+from news.fragments import get_fragment_versions
+from news.models import Article
+from users.utils import get_role_names
+
+
+# Validators for conditional GETs.
+# Both validators cover the page's own timestamps and the cache scopes it depends
+# on (comment counts, sidebars, deletions): fragment versions are time_ns() of
+# the last bump, so they double as modification times for Last-Modified. The
+# ETag also covers who is looking, down to the session, since logged-in pages
+# differ and a login or logout must not be answered with the other user's 304.
+# Used with django's @condition so a matching If-None-Match / If-Modified-Since
+# returns 304 before any rendering; @revalidate makes clients always ask, and keeps
+# logged-in pages out of shared caches. Validators run one small indexed query,
+# memoised on the request so the ETag and Last-Modified functions share it.
+
+def _etag(*parts):
+    return hashlib.md5("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _viewer(request):
+    if not request.user.is_authenticated:
+        return "anon"
+    # The session key changes on every login, so validators from an earlier session never match
+    return f"{request.user.pk}:{request.session.session_key}:{','.join(sorted(get_role_names(request.user)))}"
+
+
+def revalidate(view):
+    """Mark responses, 304s included, as needing revalidation; private when logged in."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if request.user.is_authenticated:
+            patch_cache_control(response, no_cache=True, private=True)
+        else:
+            patch_cache_control(response, no_cache=True)
+        return response
+
+    return wrapper
+
+
+def _memoise(request, key, compute):
+    cache = request.__dict__.setdefault("_validators", {})
+    if key not in cache:
+        cache[key] = compute()
+    return cache[key]
+
+
+def _versions(request, names):
+    return _memoise(request, ("versions", *names), lambda: get_fragment_versions(names))
+
+
+def _last_modified(timestamps, versions):
+    # Newest of the page's timestamps and the bump times of its scopes
+    bumped = datetime.fromtimestamp(max(versions.values()) / 1e9, tz=timezone.utc)
+    return max([ts for ts in timestamps if ts is not None] + [bumped])
+
+
+def _article_row(request, slug):
+    from comments.models import Comment
+
+    def compute():
+        latest_comment = Comment.objects.filter(article=OuterRef("pk")).order_by("-created_at").values("created_at")[:1]
+        return (
+            Article.objects.filter(slug=slug, status="published")
+            .annotate(last_comment_at=Subquery(latest_comment))
+            .values_list("pk", "category_id", "updated_at", "last_comment_at")
+            .first()
+        )
+
+    return _memoise(request, ("article", slug), compute)
+
+
+def _article_versions(request, row):
+    # article:<pk> is bumped by comment changes, so it covers the comment count
+    pk, category_id = row[:2]
+    return _versions(request, (f"article:{pk}", f"category:{category_id}", "related"))
+
+
+def article_last_modified(request, slug):
+    row = _article_row(request, slug)
+    if row is None:
+        return None
+    return _last_modified(row[2:], _article_versions(request, row))
+
+
+def article_etag(request, slug):
+    row = _article_row(request, slug)
+    if row is None:
+        return None
+    pk, category_id, updated_at, last_comment_at = row
+    versions = _article_versions(request, row)
+    return _etag(updated_at.isoformat(), last_comment_at and last_comment_at.isoformat(), *versions.values(), _viewer(request))
+
+
+def _latest_update(request, key, queryset):
+    # Any status: unpublishing an article bumps its updated_at too
+    return _memoise(request, key, lambda: queryset.order_by("-updated_at").values_list("updated_at", flat=True).first())
+
+
+# "articles" is bumped by comment changes and deletions, "trending" by update_trending
+LIST_SCOPES = ("articles", "categories", "trending")
+
+
+def article_list_last_modified(request):
+    latest = _latest_update(request, "list", Article.objects.all())
+    return _last_modified([latest], _versions(request, LIST_SCOPES))
+
+
+def article_list_etag(request):
+    latest = _latest_update(request, "list", Article.objects.all())
+    versions = _versions(request, LIST_SCOPES)
+    return _etag(latest and latest.isoformat(), *versions.values(), _viewer(request))
+
+
+def category_last_modified(request, pk):
+    latest = _latest_update(request, ("category", pk), Article.objects.filter(category_id=pk))
+    return _last_modified([latest], _versions(request, (f"category:{pk}",)))
+
+
+def category_etag(request, pk):
+    latest = _latest_update(request, ("category", pk), Article.objects.filter(category_id=pk))
+    versions = _versions(request, (f"category:{pk}",))
+    return _etag(pk, latest and latest.isoformat(), *versions.values(), _viewer(request))
@@ -0,0 +1,120 @@
+import hashlib
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from news.fragments import get_fragment_version
+from news.models import Article, Category
+
+
+# RSS and Atom feeds, site-wide and per category.
+# The rendered XML is cached under the version of the feed's scope ("feed" or
+# "feed:category:<pk>"), which news/signals.py bumps only when a published article
+# in that scope changes. Between bumps every poll is a cache read, and the ETag is
+# derived from the version so most polls end in a 304.
+
+FEED_SIZE = 30
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class LatestArticlesFeed(Feed):
+    title = "Daily Dispatch"
+    link = reverse_lazy("news:article_list")
+    description = "The latest stories from Daily Dispatch."
+
+    def published(self):
+        return Article.objects.filter(status="published").select_related("author", "category").defer("content")
+
+    def items(self):
+        return self.published().order_by("-created_at", "-id")[:FEED_SIZE]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_link(self, item):
+        return reverse("news:article_detail", args=[item.slug])
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_categories(self, item):
+        return [item.category.name] if item.category else []
+
+
+class LatestArticlesAtomFeed(LatestArticlesFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestArticlesFeed.description
+
+
+class CategoryFeed(LatestArticlesFeed):
+    def get_object(self, request, pk):
+        return get_object_or_404(Category, pk=pk)
+
+    def title(self, obj):
+        return f"{obj.name} — Daily Dispatch"
+
+    def link(self, obj):
+        return reverse("news:category_detail", args=[obj.pk])
+
+    def description(self, obj):
+        return f"The latest {obj.name} stories from Daily Dispatch."
+
+    def items(self, obj):
+        return self.published().filter(category=obj).order_by("-created_at", "-id")[:FEED_SIZE]
+
+
+class CategoryAtomFeed(CategoryFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+def cached_feed(feed_class, scope):
+    """Serve ``feed_class`` from a cached blob keyed on the version of ``scope``."""
+    feed = feed_class()
+
+    def view(request, **kwargs):
+        version = get_fragment_version(scope.format(**kwargs))
+        # Links in the feed are absolute, so the host is part of the key
+        key = "|".join([feed_class.__name__, request.get_host(), *map(str, kwargs.values()), str(version)])
+        etag = f'"{hashlib.md5(key.encode()).hexdigest()}"'
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        cache_key = f"news:feed:{hashlib.md5(key.encode()).hexdigest()}"
+        blob = cache.get(cache_key)
+        if blob is None:
+            rendered = feed(request, **kwargs)
+            blob = (rendered.content, rendered["Content-Type"], rendered.get("Last-Modified"))
+            cache.set(cache_key, blob, FEED_CACHE_TIMEOUT)
+
+        content, content_type, last_modified = blob
+        response = HttpResponse(content, content_type=content_type)
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = last_modified
+        return response
+
+    return view
+
+
+latest_rss = cached_feed(LatestArticlesFeed, "feed")
+latest_atom = cached_feed(LatestArticlesAtomFeed, "feed")
+category_rss = cached_feed(CategoryFeed, "feed:category:{pk}")
+category_atom = cached_feed(CategoryAtomFeed, "feed:category:{pk}")
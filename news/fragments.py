@@ -0,0 +1,33 @@
+import time
+
+from django.core.cache import cache
+
+
+# Versioned template fragments.
+# Templates include the version in their {% cache %} key, and signals bump it,
+# so a change makes the old fragment unreachable without deleting anything.
+
+def _version_key(name):
+    return f"news:fragment_version:{name}"
+
+
+def get_fragment_version(name):
+    version = cache.get(_version_key(name))
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version
+        version = time.time_ns()
+        cache.add(_version_key(name), version, None)
+        version = cache.get(_version_key(name), version)
+    return version
+
+
+def bump_fragment_version(name):
+    cache.set(_version_key(name), time.time_ns(), None)
+
+
+def get_fragment_versions(names):
+    found = cache.get_many([_version_key(name) for name in names])
+    return {
+        name: found[_version_key(name)] if _version_key(name) in found else get_fragment_version(name)
+        for name in names
+    }
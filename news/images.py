@@ -0,0 +1,103 @@
+import logging
+import posixpath
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection, transaction
+from news.imaging import render_variants
+
+logger = logging.getLogger(__name__)
+
+
+# Responsive image variants.
+# Each uploaded image gets WebP and JPEG copies at a few widths plus a tiny blurred
+# placeholder. The result is stored as JSON next to the image field and rendered
+# by the {% responsive_image %} tag; the pixel work lives in news.imaging.
+# Generation runs in a small thread pool after the upload's transaction commits,
+# so it stays off the request path. Rows whose
+# variants don't match their image are the queue for `build_image_variants`:
+# on SQLite (one writer) and for the shared default images nothing is built on
+# save, and the command picks them up.
+
+META_CACHE_TIMEOUT = 60 * 60 * 24
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image-variants")
+# Many rows share one file (the default avatar), so builds are serialised per name
+# and their metadata cached for reuse
+_name_locks = defaultdict(threading.Lock)
+_name_locks_guard = threading.Lock()
+
+
+def read_source(name, storage=default_storage):
+    with storage.open(name, "rb") as f:
+        return f.read()
+
+
+def save_variants(name, rendered, storage=default_storage):
+    """Save the output of ``render_variants`` next to ``name`` and return its metadata."""
+    width, height, files, placeholder = rendered
+    folder, filename = posixpath.split(name)
+    # Keep the source extension so foo.jpg and foo.png don't share variants
+    stem, ext = posixpath.splitext(filename)
+    stem = f"{stem}-{ext.lstrip('.').lower()}" if ext else stem
+    meta = {"source": name, "width": width, "height": height}
+
+    for w, key, data in files:
+        variant_name = posixpath.join(folder, "variants", f"{stem}-{w}w.{key}")
+        if storage.exists(variant_name):
+            storage.delete(variant_name)
+        meta.setdefault(key, {})[str(w)] = storage.save(variant_name, ContentFile(data))
+
+    meta["placeholder"] = placeholder
+    return meta
+
+
+def build_variants(name, storage=default_storage):
+    """Write the variants for the image at ``name`` and return their metadata."""
+    return save_variants(name, render_variants(read_source(name, storage)), storage)
+
+
+def _meta_key(name):
+    return f"news:image_variants:{name}"
+
+
+def _generate(model, pk, field_name, variants_field, name, on_done):
+    storage = model._meta.get_field(field_name).storage
+    try:
+        if not storage.exists(name):
+            logger.warning("Image %s is missing, skipping variants", name)
+            return
+        with _name_locks_guard:
+            lock = _name_locks[name]
+        with lock:
+            meta = cache.get(_meta_key(name))
+            if meta is None:
+                meta = build_variants(name, storage)
+                cache.set(_meta_key(name), meta, META_CACHE_TIMEOUT)
+        # Only store if the image wasn't replaced again in the meantime
+        updated = model.objects.filter(pk=pk, **{field_name: name}).update(**{variants_field: meta})
+        if updated and on_done:
+            on_done(pk)
+    except Exception:
+        logger.exception("Could not build image variants for %s", name)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(instance, field_name, variants_field, on_done=None):
+    name = getattr(instance, field_name).name
+    if not name or (getattr(instance, variants_field) or {}).get("source") == name:
+        return
+    # The default image is shared by every new row; the command builds it once for all of them
+    if name == instance._meta.get_field(field_name).default:
+        return
+    # SQLite allows one writer, so a background UPDATE would make the request's own
+    # writes fail; leave the row for `build_image_variants`
+    if connection.vendor == "sqlite":
+        return
+    model, pk = type(instance), instance.pk
+    transaction.on_commit(lambda: _executor.submit(_generate, model, pk, field_name, variants_field, name, on_done))
@@ -0,0 +1,52 @@
+import base64
+from io import BytesIO
+
+from PIL import Image, ImageFilter, ImageOps
+
+
+# Pixel work for responsive image variants.
+# Kept free of Django imports: `build_image_variants` runs render_variants() in
+# worker processes, which under the spawn/forkserver start methods import this
+# module fresh, without settings or an app registry. news.images does the storage
+# side (reading the source, saving the encoded files, recording the metadata).
+
+WIDTHS = (160, 320, 640, 960, 1280)
+FORMATS = (("webp", "WEBP", {"quality": 80, "method": 4}), ("jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}))
+PLACEHOLDER_WIDTH = 16
+
+
+def variant_widths(width):
+    widths = [w for w in WIDTHS if w < width]
+    widths.append(min(width, WIDTHS[-1]))
+    return widths
+
+
+def _encode(image, fmt, options):
+    buffer = BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def render_variants(data):
+    """Encode the image in ``data`` at every variant width and format.
+
+    Returns ``(width, height, files, placeholder)`` where ``files`` is a list of
+    ``(width, format_key, bytes)`` and ``placeholder`` a data: URI.
+    """
+    image = Image.open(BytesIO(data))
+    image = ImageOps.exif_transpose(image)
+    image.load()
+    image = image.convert("RGB")
+    width, height = image.size
+
+    files = []
+    for w in variant_widths(width):
+        resized = image if w == width else image.resize((w, max(round(height * w / width), 1)), Image.LANCZOS)
+        for key, fmt, options in FORMATS:
+            files.append((w, key, _encode(resized, fmt, options)))
+
+    placeholder = image.copy()
+    placeholder.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH))
+    placeholder = placeholder.filter(ImageFilter.GaussianBlur(1))
+    encoded = base64.b64encode(_encode(placeholder, "JPEG", {"quality": 40})).decode()
+    return width, height, files, f"data:image/jpeg;base64,{encoded}"
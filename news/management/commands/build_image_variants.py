@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from news.fragments import bump_fragment_version
+from news.imaging import render_variants
+from news.images import read_source, save_variants
+from news.models import Article
+from users.models import Profile
+
+# Images held in memory per worker (read and waiting, or rendered and unsaved)
+IN_FLIGHT_PER_WORKER = 2
+
+
+class Command(BaseCommand):
+    help = (
+        "Build responsive WebP/JPEG variants for article and profile images that don't have them yet, "
+        "including new uploads on SQLite and the shared default images. Run periodically (e.g. from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+        parser.add_argument("--force", action="store_true", help="Rebuild images that already have variants.")
+        parser.add_argument("--profiles", action="store_true", help="Also process profile images.")
+
+    @staticmethod
+    def _storage(rows):
+        model, _, field, _ = rows[0]
+        return model._meta.get_field(field).storage
+
+    def handle(self, *args, **options):
+        targets = [(Article, "image", "image_variants")]
+        if options["profiles"]:
+            targets.append((Profile, "profile_image", "profile_image_variants"))
+
+        # image name -> [(model, pk, field, variants_field)]; shared defaults are only built once
+        pending = {}
+        for model, field, variants_field in targets:
+            rows = model.objects.exclude(**{f"{field}__isnull": True}).exclude(**{field: ""}).values_list("pk", field, variants_field)
+            for pk, name, variants in rows.iterator(chunk_size=2000):
+                if options["force"] or (variants or {}).get("source") != name:
+                    pending.setdefault(name, []).append((model, pk, field, variants_field))
+
+        if not pending:
+            self.stdout.write("Nothing to do.")
+            return
+
+        # Workers only get bytes and run news.imaging, which doesn't import Django, so
+        # this works under any start method; storage and the ORM stay in this process.
+        # Don't hand open connections to forked workers all the same
+        connections.close_all()
+
+        workers = options["workers"] or os.cpu_count() or 1
+        names = iter(pending)
+        running = {}
+        built = failed = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                # Top up from where the last pass stopped, keeping memory bounded
+                for name in names:
+                    try:
+                        data = read_source(name, self._storage(pending[name]))
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"{name}: {exc}")
+                        continue
+                    running[pool.submit(render_variants, data)] = name
+                    if len(running) >= workers * IN_FLIGHT_PER_WORKER:
+                        break
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        meta = save_variants(name, future.result(), self._storage(pending[name]))
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"{name}: {exc}")
+                        continue
+                    for model, pk, field, variants_field in pending[name]:
+                        if model.objects.filter(pk=pk, **{field: name}).update(**{variants_field: meta}) and model is Article:
+                            bump_fragment_version(f"article:{pk}")
+                    built += 1
+
+        bump_fragment_version("articles")
+        self.stdout.write(self.style.SUCCESS(f"Built variants for {built} images ({failed} failed)."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from news.related import TOP_K, rebuild_related, update_related
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute TF-IDF related articles. Incremental by default: only articles published, edited or "
+        "unpublished since the last run are re-tokenised. Run it every few minutes (e.g. from cron) so new "
+        "stories get related links soon after publishing, and --full nightly to refresh every weight."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recompute neighbours for every published article.")
+        parser.add_argument("--top-k", type=int, default=TOP_K)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options["full"]:
+            articles, links = rebuild_related(options["top_k"], options["batch_size"])
+        else:
+            articles, links = update_related(options["top_k"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Stored {links} related links for {articles} articles."))
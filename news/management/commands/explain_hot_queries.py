@@ -0,0 +1,64 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.contrib.auth.models import User
+from comments.models import Comment
+from news.models import Article, RelatedArticle
+from users.utils import search_users
+
+
+# Full table scans in EXPLAIN output: SQLite prints "SCAN <table>" with nothing
+# after it, Postgres prints "Seq Scan on <table>".
+FULL_SCAN_PATTERNS = [
+    re.compile(r"\bSCAN (\w+)\s*$", re.MULTILINE),
+    re.compile(r"Seq Scan on (\w+)"),
+]
+
+
+def hot_queries():
+    # The query shapes the views actually run, with placeholder values
+    now = timezone.now()
+    published = Article.objects.filter(status="published").defer("content")
+    keyset = Q(created_at__lt=now) | Q(created_at=now, id__lt=1)
+    return [
+        ("article_list: first page", published.order_by("-created_at", "-id")[:7]),
+        ("article_list: later page", published.filter(keyset).order_by("-created_at", "-id")[:7]),
+        ("article_list: trending", Article.objects.filter(status="published", trending_score__gt=0).order_by("-trending_score")[:20]),
+        ("category_detail", published.filter(category_id=1).order_by("-created_at", "-id")[:13]),
+        ("category_detail: later page", published.filter(category_id=1).filter(keyset).order_by("-created_at", "-id")[:13]),
+        ("review_articles: pending", Article.objects.filter(status="pending").order_by("-created_at", "-id")[:21]),
+        ("reporter_dashboard", Article.objects.filter(author_id=1).order_by("-created_at", "-id")[:21]),
+        ("article_detail: article", Article.objects.filter(slug="example", status="published")),
+        ("article_detail: comments", Comment.objects.filter(article_id=1).order_by("-created_at")),
+        ("conditional GET: article_list", Article.objects.order_by("-updated_at").values("updated_at")[:1]),
+        ("conditional GET: category_detail", Article.objects.filter(category_id=1).order_by("-updated_at").values("updated_at")[:1]),
+        ("user_list: search", search_users(User.objects.all(), "ann").order_by("username")[:51]),
+        ("article_detail: related", RelatedArticle.objects.filter(article_id=1).order_by("-score")[:5]),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Print EXPLAIN plans for the hot view queries and fail if any of them falls back to a full table scan."
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, queryset in hot_queries():
+            with transaction.atomic():
+                if connection.vendor == "postgresql":
+                    # Small tables make seq scans look cheap; ask whether an index can be used at all
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET LOCAL enable_seqscan = off")
+                plan = queryset.explain()
+
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan + "\n")
+            scanned = {table for pattern in FULL_SCAN_PATTERNS for table in pattern.findall(plan)}
+            if scanned:
+                failures.append(f"{name}: full scan of {', '.join(sorted(scanned))}")
+
+        if failures:
+            raise CommandError("Full table scans found:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("No hot query falls back to a full table scan."))
@@ -0,0 +1,217 @@
+import csv
+import json
+import time
+from collections import Counter, defaultdict
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.text import slugify
+from news.fragments import bump_fragment_version
+from news.author_stats import add_to_delta, apply_deltas, new_delta
+from news.models import Article, Category
+from news.search import get_search_backend
+from news.stats import invalidate_dashboard_stats
+
+
+SLUG_LENGTH = 50
+SLUG_STEM_LENGTH = SLUG_LENGTH - 7  # room for "-999999"
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream articles from a CSV or JSONL file into the database with bulk inserts. "
+        "Columns: title, content, category (name), author (username or email), status."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument("--status", choices=["pending", "published"], default="published", help="Status for rows that don't set one.")
+        parser.add_argument("--default-author", help="Username to use when a row's author is missing or unknown.")
+        parser.add_argument("--create-categories", action="store_true", help="Create categories that don't exist yet.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+        fmt = options["format"] or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+
+        self.options = options
+        self.categories = {c.name.lower(): c.pk for c in Category.objects.only("id", "name")}
+        self.authors = {}
+        self.default_author_id = None
+        if options["default_author"]:
+            self.default_author_id = User.objects.filter(username=options["default_author"]).values_list("id", flat=True).first()
+            if self.default_author_id is None:
+                raise CommandError(f"Unknown default author {options['default_author']!r}.")
+
+        created = skipped = self.malformed = 0
+        self.unresolved = Counter()
+        # Categories (None for uncategorised) that received published articles
+        self.published_categories = set()
+        started = time.monotonic()
+        with path.open(newline="", encoding="utf-8") as f:
+            records = self.read_records(f, fmt)
+            while True:
+                chunk = list(islice(records, options["chunk_size"]))
+                if not chunk:
+                    break
+                new = self.import_chunk(chunk)
+                created += new
+                skipped += len(chunk) - new
+                elapsed = max(time.monotonic() - started, 1e-6)
+                self.stdout.write(f"{created} imported, {skipped} skipped ({created / elapsed:.0f} articles/s)")
+
+        if created:
+            bump_fragment_version("articles")
+            bump_fragment_version("trending")
+            bump_fragment_version("sitemap")
+            invalidate_dashboard_stats()
+        if self.published_categories:
+            bump_fragment_version("feed")
+            for category_id in self.published_categories - {None}:
+                bump_fragment_version(f"category:{category_id}")
+                bump_fragment_version(f"feed:category:{category_id}")
+        skipped += self.malformed
+        if self.unresolved:
+            authors = ", ".join(f"{name} ({n})" for name, n in self.unresolved.most_common())
+            self.stderr.write(f"Skipped rows with unknown authors: {authors}. Use --default-author to import them anyway.")
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} articles, skipped {skipped}."))
+
+    def read_records(self, f, fmt):
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    record = None
+                    error = e.msg
+                else:
+                    error = "not a JSON object"
+                if not isinstance(record, dict):
+                    self.stderr.write(f"Line {number}: {error}, skipped.")
+                    self.malformed += 1
+                    continue
+                yield record
+
+    def resolve_authors(self, keys):
+        # Keys are lowercased; match them through the LOWER() indexes from users/0011
+        missing = {key for key in keys if key and key not in self.authors}
+        if missing:
+            for pk, username, email in (
+                User.objects.annotate(username_key=Lower("username"), email_key=Lower("email"))
+                .filter(Q(username_key__in=missing) | Q(email_key__in=missing))
+                .values_list("id", "username", "email")
+            ):
+                self.authors[username.lower()] = pk
+                if email:
+                    self.authors.setdefault(email.lower(), pk)
+            for key in missing - self.authors.keys():
+                self.authors[key] = None
+
+    def resolve_category(self, name):
+        if not name:
+            return None
+        key = name.strip().lower()
+        if key not in self.categories and self.options["create_categories"]:
+            self.categories[key] = Category.objects.get_or_create(name=name.strip())[0].pk
+        return self.categories.get(key)
+
+    def assign_slugs(self, articles):
+        # Collisions with existing rows and within the chunk. Bases and the
+        # suffixes of colliding stems are fetched in bulk; `seen` holds every
+        # slug handed out so far, so "Hello", "Hello", "Hello 2" can't clash.
+        bases = [slugify(a.title)[:SLUG_LENGTH] or "article" for a in articles]
+        taken = set(Article.objects.filter(slug__in=set(bases)).values_list("slug", flat=True))
+        counts = Counter(bases)
+        next_suffix = self.existing_suffixes({base[:SLUG_STEM_LENGTH] for base in bases if base in taken or counts[base] > 1})
+
+        seen = set()
+        for article, base in zip(articles, bases):
+            slug = base
+            if slug in taken or slug in seen:
+                stem = base[:SLUG_STEM_LENGTH]
+                if stem not in next_suffix:
+                    next_suffix.update(self.existing_suffixes({stem}))
+                n = next_suffix[stem]
+                while f"{stem}-{n}" in seen:
+                    n += 1
+                slug = f"{stem}-{n}"
+                next_suffix[stem] = n + 1
+            article.slug = slug
+            seen.add(slug)
+
+    def existing_suffixes(self, stems):
+        # stem -> first numeric suffix above any "<stem>-<n>" slug already stored
+        found = dict.fromkeys(stems, 2)
+        if stems:
+            query = Q()
+            for stem in stems:
+                query |= Q(slug__startswith=f"{stem}-")
+            for slug in Article.objects.filter(query).values_list("slug", flat=True):
+                stem, _, suffix = slug.rpartition("-")
+                if stem in found and suffix.isdigit():
+                    found[stem] = max(found[stem], int(suffix) + 1)
+        return found
+
+    def import_chunk(self, records):
+        self.resolve_authors({(r.get("author") or "").strip().lower() for r in records})
+
+        articles = []
+        now = timezone.now()
+        for record in records:
+            title = (record.get("title") or "").strip()
+            content = record.get("content") or ""
+            author = (record.get("author") or "").strip()
+            author_id = self.authors.get(author.lower()) or self.default_author_id
+            if author_id is None:
+                self.unresolved[author or "(blank)"] += 1
+            if not title or not content or author_id is None:
+                continue
+
+            status = record.get("status") or self.options["status"]
+            status = status if status in ("pending", "published") else self.options["status"]
+            article = Article(
+                title=title[:200],
+                content=content,
+                author_id=author_id,
+                category_id=self.resolve_category(record.get("category")),
+                status=status,
+                published_at=now if status == "published" else None,
+            )
+            article.update_excerpt()
+            articles.append(article)
+
+        if not articles:
+            return 0
+
+        with transaction.atomic():
+            self.assign_slugs(articles)
+            Article.objects.bulk_create(articles)
+            if any(article.pk is None for article in articles):
+                ids = dict(Article.objects.filter(slug__in=[a.slug for a in articles]).values_list("slug", "id"))
+                for article in articles:
+                    article.pk = ids[article.slug]
+            get_search_backend().index(
+                (a.pk, a.title, a.content) for a in articles if a.status == "published"
+            )
+
+            deltas = defaultdict(new_delta)
+            for article in articles:
+                deltas[article.author_id]["total"] += 1
+                add_to_delta(deltas[article.author_id], article.status, published_at=article.published_at)
+            apply_deltas(deltas)
+
+        self.published_categories.update(a.category_id for a in articles if a.status == "published")
+        return len(articles)
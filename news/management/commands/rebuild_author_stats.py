@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from news.author_stats import rebuild_author_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute AuthorStats for every author from the articles table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            authors = rebuild_author_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {authors} authors."))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from news.models import Article
+from news.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for all published articles."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        backend = get_search_backend()
+        rows = (
+            Article.objects.filter(status="published")
+            .order_by("id")
+            .values_list("id", "title", "content")
+            .iterator(chunk_size=batch_size)
+        )
+
+        total = 0
+        with transaction.atomic():
+            backend.clear()
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    backend.index(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                backend.index(batch)
+                total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} articles with {type(backend).__name__}."))
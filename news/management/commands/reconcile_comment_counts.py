@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from comments.models import Comment
+from news.models import Article
+
+
+class Command(BaseCommand):
+    help = "Recompute Article.comment_count for every article whose stored count has drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Report drifted articles without fixing them.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        counts = (
+            Comment.objects.filter(article=OuterRef("pk"))
+            .order_by()
+            .values("article")
+            .annotate(c=Count("id"))
+            .values("c")
+        )
+        drifted = (
+            Article.objects.annotate(actual=Coalesce(Subquery(counts), 0))
+            .exclude(comment_count=F("actual"))
+            .values_list("pk", "actual")
+            .iterator(chunk_size=batch_size)
+        )
+
+        fixed = 0
+        batch = []
+        for pk, actual in drifted:
+            batch.append(Article(pk=pk, comment_count=actual))
+            if len(batch) >= batch_size:
+                fixed += self._flush(batch, options["dry_run"])
+                batch = []
+        if batch:
+            fixed += self._flush(batch, options["dry_run"])
+
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {fixed} articles with drifted comment counts."))
+
+    def _flush(self, batch, dry_run):
+        if not dry_run:
+            with transaction.atomic():
+                Article.objects.bulk_update(batch, ["comment_count"])
+        return len(batch)
@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from news.fragments import bump_fragment_version
+from news.models import Article
+from news.tracking import TRENDING_WINDOW_DAYS, trending_score
+
+
+class Command(BaseCommand):
+    help = "Recompute time-decayed trending scores and refresh the trending sidebar. Run periodically (e.g. from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--window-days", type=int, default=TRENDING_WINDOW_DAYS)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        cutoff = now - timedelta(days=options["window_days"])
+        rows = (
+            Article.objects.filter(status="published", created_at__gte=cutoff)
+            .values_list("id", "view_count", "created_at")
+            .iterator(chunk_size=options["batch_size"])
+        )
+
+        scored = []
+        for pk, views, created_at in rows:
+            age_hours = (now - created_at).total_seconds() / 3600
+            scored.append(Article(pk=pk, trending_score=trending_score(views, age_hours)))
+
+        with transaction.atomic():
+            # Articles that aged out of the window drop off the ranking
+            Article.objects.filter(trending_score__gt=0).exclude(
+                status="published", created_at__gte=cutoff
+            ).update(trending_score=0)
+            Article.objects.bulk_update(scored, ["trending_score"], batch_size=options["batch_size"])
+
+        ranked = sum(1 for a in scored if a.trending_score > 0)
+        bump_fragment_version("trending")
+        bump_fragment_version("articles")
+
+        self.stdout.write(self.style.SUCCESS(f"Scored {len(scored)} articles; {ranked} currently trending."))
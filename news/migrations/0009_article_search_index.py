@@ -0,0 +1,48 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS news_article_fts "
+            "USING fts5(title, content, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            "INSERT INTO news_article_fts (rowid, title, content) "
+            "SELECT id, title, content FROM news_article WHERE status = 'published'"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE TABLE IF NOT EXISTS news_article_search ("
+            "article_id bigint PRIMARY KEY REFERENCES news_article (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS news_article_search_document_gin "
+            "ON news_article_search USING GIN (document)"
+        )
+        schema_editor.execute(
+            "INSERT INTO news_article_search (article_id, document) "
+            "SELECT id, setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', content), 'B') "
+            "FROM news_article WHERE status = 'published'"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS news_article_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP TABLE IF EXISTS news_article_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0008_alter_article_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:56
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_comment_count(apps, schema_editor):
+    Article = apps.get_model('news', 'Article')
+    Comment = apps.get_model('comments', 'Comment')
+    counts = Comment.objects.filter(article=OuterRef('pk')).order_by().values('article').annotate(c=Count('id')).values('c')
+    Article.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0009_article_search_index'),
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_comment_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:56
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def populate_excerpts(apps, schema_editor):
+    Article = apps.get_model('news', 'Article')
+    batch = []
+    for article in Article.objects.only('id', 'content').iterator(chunk_size=500):
+        article.excerpt = Truncator(article.content).words(50)
+        article.word_count = len(article.content.split())
+        batch.append(article)
+        if len(batch) >= 500:
+            Article.objects.bulk_update(batch, ['excerpt', 'word_count'])
+            batch = []
+    if batch:
+        Article.objects.bulk_update(batch, ['excerpt', 'word_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0010_article_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_excerpts, migrations.RunPython.noop),
+    ]
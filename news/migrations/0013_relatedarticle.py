@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0012_article_view_count_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='related_built_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='RelatedArticle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='news.article')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='news.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['article', '-score'], name='news_relate_article_017a8c_idx')],
+                'unique_together': {('article', 'related')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_author_stats(apps, schema_editor):
+    Article = apps.get_model("news", "Article")
+    AuthorStats = apps.get_model("news", "AuthorStats")
+    rows = (
+        Article.objects.order_by()
+        .values("author_id")
+        .annotate(
+            total=models.Count("id"),
+            pending=models.Count("id", filter=models.Q(status="pending")),
+            published=models.Count("id", filter=models.Q(status="published")),
+            last_published_at=models.Max("updated_at", filter=models.Q(status="published")),
+        )
+    )
+    AuthorStats.objects.bulk_create(
+        [AuthorStats(author_id=row.pop("author_id"), **row) for row in rows], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('news', '0016_conditional_get_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='article_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('published', models.PositiveIntegerField(default=0)),
+                ('last_published_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'author stats',
+            },
+        ),
+        migrations.RunPython(populate_author_stats, migrations.RunPython.noop),
+    ]
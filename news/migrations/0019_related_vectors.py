@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0018_cache_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleVector',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='vector', serialize=False, to='news.article')),
+                ('terms', models.JSONField(default=list)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DocumentFrequency',
+            fields=[
+                ('term', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('df', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TermPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('weight', models.FloatField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='term_postings', to='news.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term'], name='news_termpo_term_566eb2_idx')],
+                'unique_together': {('article', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:44
+
+from django.db import migrations, models
+
+
+def backfill_published_at(apps, schema_editor):
+    Article = apps.get_model("news", "Article")
+    AuthorStats = apps.get_model("news", "AuthorStats")
+    # The real publish time was never stored; updated_at is the closest we have
+    Article.objects.filter(status="published").update(published_at=models.F("updated_at"))
+    latest = (
+        Article.objects.filter(author_id=models.OuterRef("author_id"), status="published")
+        .order_by()
+        .values("author_id")
+        .annotate(latest=models.Max("published_at"))
+        .values("latest")
+    )
+    AuthorStats.objects.update(last_published_at=models.Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0019_related_vectors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='published_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+    ]
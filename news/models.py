@@ -1,6 +1,7 @@
 from django.db import models
+from django.utils import timezone
 from users.forms import User
-from django.utils.text import slugify
+from django.utils.text import slugify, Truncator
 # from cloudinary.models import CloudinaryField
 
 # Create your models here.
@@ -14,6 +15,8 @@ class Category(models.Model):
 
 
 class Article(models.Model):
+    EXCERPT_WORDS = 50
+
     STATUS_CHOICES = (
         ("pending", "Pending"),
         ("published", "Published"),
@@ -22,17 +25,149 @@ class Article(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True, blank=True)
     content = models.TextField()
+    excerpt = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
     image = models.ImageField(upload_to='article_images/', blank=True, null=True, default='article_images/breaking.webp')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True,  related_name="articles")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    # Stamped on every move to published; the single source for "last published" times
+    published_at = models.DateTimeField(null=True, blank=True, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    view_count = models.PositiveIntegerField(default=0, editable=False)
+    trending_score = models.FloatField(default=0, editable=False)
+    related_built_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Field-change tracking: values as loaded from the database, so signal
+    # handlers can compare against them without re-querying the row
+    TRACKED_FIELDS = ("status", "slug", "category", "author")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_tracked_fields()
+
+    def _snapshot_tracked_fields(self):
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            name: getattr(self, self._meta.get_field(name).attname)
+            for name in self.TRACKED_FIELDS
+            if self._meta.get_field(name).attname not in deferred
+        }
+
+    def previous(self, name):
+        """Value of a tracked field when the instance was loaded (None for new articles)."""
+        return getattr(self, "_loaded_values", {}).get(name)
+
+    def has_changed(self, name):
+        loaded = getattr(self, "_loaded_values", {})
+        if name not in loaded:
+            return self._state.adding
+        return loaded[name] != getattr(self, self._meta.get_field(name).attname)
 
     def save(self, *args, **kwargs):
         if not self.pk and not self.slug:
             self.slug = slugify(self.title)[:50]
+        # Listings render the stored excerpt so they can defer the full body
+        if "content" not in self.get_deferred_fields():
+            self.update_excerpt()
+        if self.status == "published" and self.has_changed("status"):
+            self.published_at = timezone.now()
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "published_at"}
         super().save(*args, **kwargs)
+        self._snapshot_tracked_fields()
+
+    def update_excerpt(self):
+        self.excerpt = Truncator(self.content).words(self.EXCERPT_WORDS)
+        self.word_count = len(self.content.split())
+
+    class Meta:
+        indexes = [
+            # Public feeds: WHERE status = 'published' ORDER BY created_at DESC, id DESC
+            models.Index(fields=["-created_at", "-id"], condition=models.Q(status="published"), name="article_published_feed_idx"),
+            models.Index(fields=["status", "-created_at", "-id"], name="article_status_feed_idx"),
+            models.Index(fields=["category", "status", "-created_at", "-id"], name="article_category_feed_idx"),
+            models.Index(fields=["author", "-created_at", "-id"], name="article_author_feed_idx"),
+            # Conditional GET validators: MAX(updated_at) overall and per category
+            models.Index(fields=["-updated_at"], name="article_updated_idx"),
+            models.Index(fields=["category", "-updated_at"], name="article_category_updated_idx"),
+            models.Index(fields=["-trending_score"], condition=models.Q(status="published", trending_score__gt=0), name="article_trending_idx"),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class RelatedArticle(models.Model):
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="related_links")
+    related = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ("article", "related")
+        indexes = [
+            models.Index(fields=["article", "-score"]),
+        ]
+
+    def __str__(self):
+        return f"{self.article} -> {self.related}"
+
+
+# Stored TF-IDF state for news/related.py, so incremental runs only tokenise the
+# articles that changed
+
+class ArticleVector(models.Model):
+    article = models.OneToOneField(Article, on_delete=models.CASCADE, primary_key=True, related_name="vector")
+    # Every distinct term of the article, to take it back out of the document frequencies
+    terms = models.JSONField(default=list)
+
+    def __str__(self):
+        return f"Vector for {self.article}"
+
+
+class TermPosting(models.Model):
+    # One weight of an article's trimmed unit vector; the term index is the inverted index
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="term_postings")
+    term = models.CharField(max_length=100)
+    weight = models.FloatField()
+
+    class Meta:
+        unique_together = ("article", "term")
+        indexes = [
+            models.Index(fields=["term"]),
+        ]
+
+    def __str__(self):
+        return f"{self.article} / {self.term}"
+
+
+class DocumentFrequency(models.Model):
+    term = models.CharField(max_length=100, primary_key=True)
+    df = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.term}: {self.df}"
+
+
+class AuthorStats(models.Model):
+    # Per-author article totals, kept current by news/author_stats.py
+    author = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="article_stats")
+    total = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+    published = models.PositiveIntegerField(default=0)
+    last_published_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "author stats"
+
+    def __str__(self):
+        return f"Stats for {self.author}"
@@ -0,0 +1,123 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from notifications.outbox import enqueue_bulk
+from news import author_stats
+from news.fragments import bump_fragment_version
+from news.models import Article
+from news.search import get_search_backend
+from news.sitemaps import is_archived
+from news.stats import invalidate_dashboard_stats
+
+
+# Bulk moderation of pending articles.
+# One conditional UPDATE ... WHERE status = 'pending' claims the batch and stamps
+# the rows it changed with this call's updated_at. The database re-checks the
+# WHERE clause under the row lock (SQLite serialises writers outright), so a
+# concurrent moderator's UPDATE skips these rows; re-selecting by the stamp gives
+# exactly the rows this call moved. Only those are published or deleted, and side
+# effects are dispatched once for them rather than through per-row signals:
+# rejected articles go through a normal QuerySet.delete(), so the ORM handles the
+# cascade, while the Article post_delete receivers stand down for the batch.
+
+MAX_MODERATION_BATCH = 200
+CLAIM_FIELDS = ("pk", "title", "slug", "created_at", "author_id", "category_id", "author__username", "author__email")
+
+
+def build_publish_email(username, title, slug):
+    subject = "Your article has been published!"
+    message = f"Hi {username},\n\nYour article '{title}' has been published.\n\nCheck it out here: http://yourdomain.com/article/{slug}/"
+    return subject, message
+
+
+_local = threading.local()
+
+
+def deleting_in_batch():
+    """True while a batch delete handles the Article post_delete side effects itself."""
+    return getattr(_local, "batch_delete", False)
+
+
+@contextmanager
+def _batch_delete():
+    _local.batch_delete = True
+    try:
+        yield
+    finally:
+        _local.batch_delete = False
+
+
+def _transition(ids, now, **changes):
+    # Must run inside a transaction, so the rows stay claimed until the batch is done
+    if not Article.objects.filter(pk__in=ids, status="pending").update(updated_at=now, **changes):
+        return []
+    return list(
+        Article.objects.filter(pk__in=ids, updated_at=now)
+        .order_by("pk")
+        .values_list(*CLAIM_FIELDS, named=True)
+    )
+
+
+def approve_articles(ids):
+    """Publish the still-pending articles among ``ids``; returns the ones that transitioned."""
+    now = timezone.now()
+    with transaction.atomic():
+        published = _transition(ids, now, status="published", published_at=now)
+        if not published:
+            return []
+        pks = [row.pk for row in published]
+
+        get_search_backend().index(Article.objects.filter(pk__in=pks).values_list("pk", "title", "content"))
+
+        deltas = defaultdict(author_stats.new_delta)
+        for row in published:
+            author_stats.add_to_delta(deltas[row.author_id], "pending", -1)
+            author_stats.add_to_delta(deltas[row.author_id], "published", published_at=now)
+        author_stats.apply_deltas(deltas)
+
+        enqueue_bulk(
+            [(*build_publish_email(row.author__username, row.title, row.slug), [row.author__email]) for row in published],
+            from_email=settings.EMAIL_HOST_USER,
+        )
+
+    _bump_public_caches(published)
+    return published
+
+
+def reject_articles(ids):
+    """Delete the still-pending articles among ``ids``; returns the ones that were removed."""
+    now = timezone.now()
+    with transaction.atomic():
+        rejected = _transition(ids, now)
+        if not rejected:
+            return []
+        pks = [row.pk for row in rejected]
+        with _batch_delete():
+            Article.objects.filter(pk__in=pks).delete()
+        get_search_backend().remove(pks)
+
+        deltas = defaultdict(author_stats.new_delta)
+        for row in rejected:
+            deltas[row.author_id]["total"] -= 1
+            author_stats.add_to_delta(deltas[row.author_id], "pending", -1)
+        author_stats.apply_deltas(deltas, create=False)
+
+    invalidate_dashboard_stats()
+    return rejected
+
+
+def _bump_public_caches(rows):
+    invalidate_dashboard_stats()
+    for scope in ("articles", "trending", "feed", "sitemap"):
+        bump_fragment_version(scope)
+    for category_id in {row.category_id for row in rows}:
+        bump_fragment_version(f"category:{category_id}")
+        bump_fragment_version(f"feed:category:{category_id}")
+    # No article:<pk> bumps: a pending article's page is never cached or given an ETag
+    # is_archived() only reads created_at and pk, which the transitioned rows carry
+    if any(is_archived(row) for row in rows):
+        bump_fragment_version("sitemap:archive")
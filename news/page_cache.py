@@ -0,0 +1,55 @@
+import hashlib
+from functools import wraps
+
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from news.fragments import get_fragment_version, get_fragment_versions
+
+
+# Full-response cache for anonymous readers.
+# A view declares what a page depends on with depend_on(); the versions of those
+# scopes are stored next to the response, and a hit is only served while every
+# one of them is unchanged. news/signals.py bumps the scopes.
+
+PAGE_CACHE_TIMEOUT = 600
+
+
+def depend_on(request, *scopes):
+    deps = getattr(request, "_page_cache_deps", None)
+    if deps is not None:
+        for scope in scopes:
+            deps[scope] = get_fragment_version(scope)
+
+
+def _page_key(request):
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"news:page:{digest}"
+
+
+def _is_cacheable(response):
+    return response.status_code == 200 and not response.cookies and not response.streaming
+
+
+def cache_anonymous_page(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != "GET" or request.user.is_authenticated:
+            response = view(request, *args, **kwargs)
+            patch_vary_headers(response, ("Cookie",))
+            return response
+
+        key = _page_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            deps, response = entry
+            if get_fragment_versions(deps) == deps:
+                return response
+
+        request._page_cache_deps = {}
+        response = view(request, *args, **kwargs)
+        patch_vary_headers(response, ("Cookie",))
+        if request._page_cache_deps and _is_cacheable(response):
+            cache.set(key, (request._page_cache_deps, response), PAGE_CACHE_TIMEOUT)
+        return response
+
+    return wrapper
@@ -0,0 +1,136 @@
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.encoding import force_bytes, force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+# Keyset (cursor) pagination, newest first on (created_at, id) by default.
+# Every page is a single indexed range query, so page N costs the same as page 1.
+# Other orderings work as long as they end in a unique column.
+
+def _json_value(value):
+    # Full precision: DjangoJSONEncoder would drop microseconds from datetimes
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def encode_cursor(direction, obj, ordering=("-created_at", "-id")):
+    values = [getattr(obj, name.lstrip("-")) for name in ordering]
+    raw = json.dumps([direction, values], default=_json_value, separators=(",", ":"))
+    return urlsafe_base64_encode(force_bytes(raw))
+
+
+def decode_cursor(token, model, ordering=("-created_at", "-id")):
+    try:
+        direction, values = json.loads(force_str(urlsafe_base64_decode(token)))
+        if direction not in ("next", "prev") or len(values) != len(ordering):
+            return None
+        fields = [model._meta.get_field(name.lstrip("-")) for name in ordering]
+        return direction, [field.to_python(value) for field, value in zip(fields, values)]
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError, ValidationError):
+        return None
+
+
+def seek(ordering, values, forward=True):
+    """Q for the rows after ``values`` in ``ordering`` (before them if not ``forward``)."""
+    condition = None
+    for name, value in reversed(list(zip(ordering, values))):
+        lookup = "lt" if name.startswith("-") == forward else "gt"
+        name = name.lstrip("-")
+        step = Q(**{f"{name}__{lookup}": value})
+        condition = step if condition is None else step | (Q(**{name: value}) & condition)
+    return condition
+
+
+def _reversed(ordering):
+    return tuple(name[1:] if name.startswith("-") else f"-{name}" for name in ordering)
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor="", previous_cursor=""):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return bool(self.next_cursor)
+
+    def has_previous(self):
+        return bool(self.previous_cursor)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Paginator that fetches one page plus a single probe row."""
+
+    def __init__(self, queryset, per_page, ordering=("-created_at", "-id")):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+
+    def _page(self, rows, has_next, has_previous):
+        next_cursor = encode_cursor("next", rows[-1], self.ordering) if has_next and rows else ""
+        previous_cursor = encode_cursor("prev", rows[0], self.ordering) if has_previous and rows else ""
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+    def get_page(self, cursor=None):
+        decoded = decode_cursor(cursor, self.queryset.model, self.ordering) if cursor else None
+
+        if decoded is None:
+            rows = list(self.queryset.order_by(*self.ordering)[:self.per_page + 1])
+            return self._page(rows[:self.per_page], len(rows) > self.per_page, False)
+
+        direction, values = decoded
+
+        if direction == "next":
+            rows = list(
+                self.queryset.filter(seek(self.ordering, values)).order_by(*self.ordering)[:self.per_page + 1]
+            )
+            return self._page(rows[:self.per_page], len(rows) > self.per_page, True)
+
+        # Walking backwards: read in reverse order from the cursor, then flip for display
+        rows = list(
+            self.queryset.filter(seek(self.ordering, values, forward=False))
+            .order_by(*_reversed(self.ordering))[:self.per_page + 1]
+        )
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return self._page(rows, True, has_previous)
+
+
+class RankedPaginator:
+    """Pages over a precomputed list of ids (e.g. search hits) in rank order."""
+
+    def __init__(self, queryset, ranked_ids, per_page):
+        self.queryset = queryset
+        self.ranked_ids = ranked_ids
+        self.per_page = per_page
+
+    def get_page(self, cursor=None):
+        try:
+            offset = max(int(force_str(urlsafe_base64_decode(cursor))), 0) if cursor else 0
+        except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+            offset = 0
+
+        page_ids = self.ranked_ids[offset:offset + self.per_page]
+        found = self.queryset.in_bulk(page_ids)
+        rows = [found[pk] for pk in page_ids if pk in found]
+
+        next_offset = offset + self.per_page
+        next_cursor = urlsafe_base64_encode(force_bytes(next_offset)) if next_offset < len(self.ranked_ids) else ""
+        previous_cursor = urlsafe_base64_encode(force_bytes(max(offset - self.per_page, 0))) if offset > 0 else ""
+        return KeysetPage(rows, next_cursor, previous_cursor)
@@ -0,0 +1,262 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from news.fragments import bump_fragment_version
+from news.models import Article, ArticleVector, DocumentFrequency, RelatedArticle, TermPosting
+
+
+# Content-similarity index for "Related Stories".
+# Articles are turned into sparse TF-IDF vectors (term -> weight dicts, trimmed
+# to their strongest terms) and compared through an inverted index, so each
+# article is only scored against articles that share a term with it. Results are
+# stored in RelatedArticle by the `build_related_articles` command.
+# The vectors (TermPosting, indexed by term, doubling as the inverted index), each
+# article's term set (ArticleVector) and the document frequencies are stored too.
+# A full rebuild recomputes everything in memory; the default incremental run only
+# tokenises articles published, edited or unpublished since the last run, adjusts
+# the document frequencies for them and scores them through the stored postings.
+# Other articles keep the weights of their last build until the next --full run.
+
+TOP_K = 5
+MAX_TERMS = 50
+TITLE_WEIGHT = 3
+MIN_SCORE = 0.05
+
+MAX_TERM_LENGTH = 100  # TermPosting.term / DocumentFrequency.term
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}", re.UNICODE)
+STOPWORDS = frozenset("""
+    about above after again against all also and any are because been before being below between both but
+    can could did does doing down during each few for from further had has have having her here hers herself
+    him himself his how into its itself just more most not now off once only other our ours out over own
+    same she should some such than that the their theirs them then there these they this those through too
+    under until very was were what when where which while who whom why will with would you your yours
+""".split())
+
+
+def tokenize(text):
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if token not in STOPWORDS and len(token) <= MAX_TERM_LENGTH
+    ]
+
+
+def term_counts(title, content):
+    counts = Counter(tokenize(content))
+    for token in tokenize(title):
+        counts[token] += TITLE_WEIGHT
+    return counts
+
+
+def weigh(counts, df, total):
+    """Trimmed, unit-length TF-IDF vector for one article's term counts."""
+    weights = {
+        term: (1 + math.log(tf)) * math.log((1 + total) / (1 + df.get(term, 0)))
+        for term, tf in counts.items()
+    }
+    top = sorted(weights.items(), key=lambda item: item[1], reverse=True)[:MAX_TERMS]
+    norm = math.sqrt(sum(w * w for _, w in top))
+    return {term: w / norm for term, w in top} if norm else {}
+
+
+def _published_rows(batch_size):
+    return (
+        Article.objects.filter(status="published")
+        .order_by("id")
+        .values_list("id", "title", "content")
+        .iterator(chunk_size=batch_size)
+    )
+
+
+def build_vectors(batch_size=500):
+    # First pass: document frequencies. Second pass: weighted, trimmed, unit-length vectors.
+    df = Counter()
+    total = 0
+    for _, title, content in _published_rows(batch_size):
+        df.update(term_counts(title, content).keys())
+        total += 1
+
+    vectors, terms = {}, {}
+    for pk, title, content in _published_rows(batch_size):
+        counts = term_counts(title, content)
+        terms[pk] = sorted(counts)
+        vectors[pk] = weigh(counts, df, total)
+    return vectors, terms, df
+
+
+def build_index(vectors):
+    index = defaultdict(list)
+    for pk, vector in vectors.items():
+        for term, weight in vector.items():
+            index[term].append((pk, weight))
+    return index
+
+
+def nearest(pk, vectors, index, k=TOP_K):
+    scores = defaultdict(float)
+    for term, weight in vectors.get(pk, {}).items():
+        for other, other_weight in index[term]:
+            if other != pk:
+                scores[other] += weight * other_weight
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return [(other, score) for other, score in ranked[:k] if score >= MIN_SCORE]
+
+
+def _store(neighbours):
+    """Replace the related lists of the articles in ``{pk: [(other, score)]}``."""
+    rows = [
+        RelatedArticle(article_id=pk, related_id=other, score=score)
+        for pk, ranked in neighbours.items()
+        for other, score in ranked
+    ]
+    RelatedArticle.objects.filter(article_id__in=list(neighbours)).delete()
+    RelatedArticle.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def _write_vectors(vectors, terms, batch_size):
+    ArticleVector.objects.bulk_create(
+        [ArticleVector(article_id=pk, terms=terms[pk]) for pk in vectors], batch_size=batch_size
+    )
+    TermPosting.objects.bulk_create(
+        [
+            TermPosting(article_id=pk, term=term, weight=weight)
+            for pk, vector in vectors.items()
+            for term, weight in vector.items()
+        ],
+        batch_size=1000,
+    )
+
+
+def _chunks(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def rebuild_related(k=TOP_K, batch_size=500):
+    started = timezone.now()
+    vectors, terms, df = build_vectors(batch_size)
+    index = build_index(vectors)
+
+    with transaction.atomic():
+        RelatedArticle.objects.all().delete()
+        TermPosting.objects.all().delete()
+        ArticleVector.objects.all().delete()
+        DocumentFrequency.objects.all().delete()
+        DocumentFrequency.objects.bulk_create(
+            [DocumentFrequency(term=term, df=n) for term, n in df.items()], batch_size=1000
+        )
+        _write_vectors(vectors, terms, batch_size)
+        stored = 0
+        for ids in _chunks(vectors, batch_size):
+            stored += _store({pk: nearest(pk, vectors, index, k) for pk in ids})
+        Article.objects.filter(status="published").update(related_built_at=started)
+
+    bump_fragment_version("related")
+    return len(vectors), stored
+
+
+def _stored_neighbours(article_ids, k):
+    # Score articles from their stored postings, visiting only articles that share a term
+    vectors = defaultdict(dict)
+    for pk, term, weight in TermPosting.objects.filter(article_id__in=article_ids).values_list("article_id", "term", "weight"):
+        vectors[pk][term] = weight
+    index = defaultdict(list)
+    for terms in _chunks({term for vector in vectors.values() for term in vector}, 500):
+        for pk, term, weight in TermPosting.objects.filter(term__in=terms).values_list("article_id", "term", "weight"):
+            index[term].append((pk, weight))
+    return {pk: nearest(pk, vectors, index, k) for pk in article_ids}
+
+
+def _update_document_frequencies(old_terms, new_terms):
+    """Apply the term-set changes and return the frequencies of every term in ``new_terms``."""
+    delta = Counter()
+    for terms in old_terms.values():
+        delta.subtract(terms)
+    for terms in new_terms.values():
+        delta.update(terms)
+
+    needed = set(delta) | {term for terms in new_terms.values() for term in terms}
+    df = {}
+    for terms in _chunks(needed, 500):
+        df.update(DocumentFrequency.objects.filter(term__in=terms).values_list("term", "df"))
+    changed = {term: max(df.get(term, 0) + n, 0) for term, n in delta.items() if n}
+    df.update(changed)
+
+    DocumentFrequency.objects.bulk_create(
+        [DocumentFrequency(term=term, df=n) for term, n in changed.items() if n],
+        update_conflicts=True, unique_fields=["term"], update_fields=["df"], batch_size=1000,
+    )
+    gone = [term for term, n in changed.items() if not n]
+    for terms in _chunks(gone, 500):
+        DocumentFrequency.objects.filter(term__in=terms).delete()
+    return df
+
+
+def update_related(k=TOP_K, batch_size=500):
+    """Refresh only articles published, edited or unpublished since their neighbours were last computed."""
+    if not ArticleVector.objects.exists():
+        # Nothing stored yet (first run, or upgraded from an older version)
+        return rebuild_related(k, batch_size)
+
+    started = timezone.now()
+    changed = list(
+        Article.objects.filter(status="published")
+        .filter(Q(related_built_at__isnull=True) | Q(related_built_at__lt=F("updated_at")))
+        .values_list("id", flat=True)
+    )
+    removed = list(ArticleVector.objects.exclude(article__status="published").values_list("article_id", flat=True))
+    if not changed and not removed:
+        return 0, 0
+
+    with transaction.atomic():
+        old_terms = dict(ArticleVector.objects.filter(article_id__in=changed + removed).values_list("article_id", "terms"))
+        counts, new_terms = {}, {}
+        for ids in _chunks(changed, batch_size):
+            for pk, title, content in Article.objects.filter(pk__in=ids).values_list("id", "title", "content"):
+                counts[pk] = term_counts(title, content)
+                new_terms[pk] = sorted(counts[pk])
+
+        df = _update_document_frequencies(old_terms, new_terms)
+        total = ArticleVector.objects.count() - len(removed) + len(set(changed) - old_terms.keys())
+        vectors = {pk: weigh(counts[pk], df, total) for pk in changed}
+
+        for ids in _chunks(changed + removed, batch_size):
+            TermPosting.objects.filter(article_id__in=ids).delete()
+            ArticleVector.objects.filter(article_id__in=ids).delete()
+        _write_vectors(vectors, new_terms, batch_size)
+
+        # Articles whose lists may now include, or should drop, a changed article
+        affected = set(changed)
+        for ids in _chunks(changed, batch_size):
+            for ranked in _stored_neighbours(ids, k).values():
+                affected.update(other for other, _ in ranked)
+        for ids in _chunks(changed + removed, batch_size):
+            affected.update(RelatedArticle.objects.filter(related_id__in=ids).values_list("article_id", flat=True))
+        affected -= set(removed)
+
+        for ids in _chunks(removed, batch_size):
+            RelatedArticle.objects.filter(article_id__in=ids).delete()
+        stored = 0
+        for ids in _chunks(sorted(affected), batch_size):
+            stored += _store(_stored_neighbours(ids, k))
+        for ids in _chunks(changed, batch_size):
+            Article.objects.filter(pk__in=ids).update(related_built_at=started)
+
+    for pk in affected:
+        bump_fragment_version(f"article:{pk}")
+    return len(affected), stored
+
+
+def get_related_articles(article, limit=TOP_K):
+    links = (
+        RelatedArticle.objects.filter(article=article, related__status="published")
+        .select_related("related__author")
+        .defer("related__content")
+        .order_by("-score")[:limit]
+    )
+    return [link.related for link in links]
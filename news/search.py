@@ -0,0 +1,142 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+
+# Full-text search over published articles.
+# SQLite uses an FTS5 virtual table and Postgres a tsvector column with a GIN index,
+# both created by news/migrations/0009_article_search_index.py. Any other backend
+# falls back to a plain icontains scan.
+
+SEARCH_RESULT_LIMIT = 500
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class BaseSearchBackend:
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Return article ids matching ``query``, best match first."""
+        raise NotImplementedError
+
+    def index(self, rows):
+        """Add or replace ``(id, title, content)`` rows in the index."""
+        raise NotImplementedError
+
+    def remove(self, article_ids):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def index_article(self, article):
+        if article.status == "published":
+            self.index([(article.pk, article.title, article.content)])
+        else:
+            self.remove([article.pk])
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    table = "news_article_fts"
+
+    def _match_expression(self, query):
+        terms = TERM_RE.findall(query)
+        # Quote every term so FTS5 operators in user input are taken literally;
+        # the last term is a prefix match to support search-as-you-type
+        return " ".join(f'"{term}"' for term in terms[:-1]) + (f' "{terms[-1]}"*' if terms else "")
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        match = self._match_expression(query).strip()
+        if not match:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s "
+                f"ORDER BY bm25({self.table}, 10.0, 1.0) LIMIT %s",
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def index(self, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(f"INSERT INTO {self.table} (rowid, title, content) VALUES (%s, %s, %s)", rows)
+
+    def remove(self, article_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(pk,) for pk in article_ids])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    table = "news_article_search"
+    config = "english"
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        if not TERM_RE.search(query):
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT article_id FROM {self.table}, websearch_to_tsquery(%s, %s) query "
+                f"WHERE document @@ query ORDER BY ts_rank_cd(document, query) DESC LIMIT %s",
+                [self.config, query, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def index(self, rows):
+        rows = [(pk, self.config, title, self.config, content) for pk, title, content in rows]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (article_id, document) VALUES "
+                f"(%s, setweight(to_tsvector(%s, %s), 'A') || setweight(to_tsvector(%s, %s), 'B')) "
+                f"ON CONFLICT (article_id) DO UPDATE SET document = EXCLUDED.document",
+                rows,
+            )
+
+    def remove(self, article_ids):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE article_id = ANY(%s)", [list(article_ids)])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {self.table}")
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        from news.models import Article
+
+        return list(
+            Article.objects.filter(status="published")
+            .filter(Q(title__icontains=query) | Q(content__icontains=query))
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)[:limit]
+        )
+
+    def index(self, rows):
+        pass
+
+    def remove(self, article_ids):
+        pass
+
+    def clear(self):
+        pass
+
+
+def get_search_backend():
+    if connection.vendor == "sqlite":
+        return SQLiteSearchBackend()
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return BasicSearchBackend()
+
+
+def search_articles(query, limit=SEARCH_RESULT_LIMIT):
+    return get_search_backend().search(query, limit)
@@ -1,18 +1,178 @@
-from django.db.models.signals import post_save
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
-from django.core.mail import send_mail
+from notifications.outbox import enqueue_email
 from django.conf import settings
-from .models import Article
+from .models import Article, Category
+from .fragments import bump_fragment_version
+from .search import get_search_backend
+from .images import schedule_variants
+from .sitemaps import is_archived
+from .stats import invalidate_dashboard_stats
+from .moderation import build_publish_email, deleting_in_batch
+from . import author_stats
 
 @receiver(post_save, sender=Article)
 def notify_reporter_on_publish(sender, instance, created, **kwargs):
     if not created and instance.status == "published":
-        previous = Article.objects.get(pk=instance.pk)
-        
-        if previous.status != instance.status and instance.status == "published":
-            subject = "Your article has been published!"
-            message = f"Hi {instance.author.username},\n\nYour article '{instance.title}' has been published.\n\nCheck it out here: http://yourdomain.com/article/{instance.slug}/"
+        if instance.has_changed("status"):
+            subject, message = build_publish_email(instance.author.username, instance.title, instance.slug)
             from_email = settings.EMAIL_HOST_USER
             recipient_list = [instance.author.email]
 
-            send_mail(subject, message, from_email, recipient_list)
+            enqueue_email(subject, message, recipient_list, from_email)
+
+
+# Keep the full-text search index in step with published articles
+@receiver(post_save, sender=Article)
+def update_search_index(sender, instance, **kwargs):
+    # Pending articles that stay pending were never indexed
+    if instance.status == "published" or instance.has_changed("status"):
+        get_search_backend().index_article(instance)
+
+
+# The Article post_delete receivers stand down while bulk moderation deletes a
+# batch, since it applies the same effects once for all the rows
+@receiver(post_delete, sender=Article)
+def remove_from_search_index(sender, instance, **kwargs):
+    if deleting_in_batch():
+        return
+    get_search_backend().remove([instance.pk])
+
+
+# Invalidate cached sidebar fragments and anonymous pages
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article_caches(sender, instance, **kwargs):
+    if deleting_in_batch():
+        return
+    bump_fragment_version("trending")
+    bump_fragment_version("articles")
+    bump_fragment_version(f"article:{instance.pk}")
+    # Related-article lists on the other pages of this category (and the old one, if it moved)
+    bump_fragment_version(f"category:{instance.category_id}")
+    if instance.has_changed("category") and instance.previous("category"):
+        bump_fragment_version(f"category:{instance.previous('category')}")
+
+
+# Feeds only list published articles, so drafts and pending edits leave them alone
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article_feeds(sender, instance, **kwargs):
+    if deleting_in_batch():
+        return
+    if instance.status != "published" and not instance.has_changed("status"):
+        return
+    bump_fragment_version("feed")
+    bump_fragment_version(f"feed:category:{instance.category_id}")
+    if instance.has_changed("category") and instance.previous("category"):
+        bump_fragment_version(f"feed:category:{instance.previous('category')}")
+
+
+# Dashboard totals only move when articles appear, disappear or change status/category
+@receiver(post_save, sender=Article)
+def invalidate_article_stats(sender, instance, created, **kwargs):
+    if created or instance.has_changed("status") or instance.has_changed("category"):
+        invalidate_dashboard_stats()
+
+
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_stats(sender, **kwargs):
+    if deleting_in_batch():
+        return
+    invalidate_dashboard_stats()
+
+
+# Per-author counters for the reporter dashboard
+@receiver(post_save, sender=Article)
+def update_author_stats(sender, instance, created, **kwargs):
+    if created:
+        author_stats.record_created(instance)
+    elif instance.has_changed("author") and instance.previous("author"):
+        author_stats.record_author_change(instance, instance.previous("author"), instance.previous("status") or instance.status)
+    elif instance.has_changed("status"):
+        author_stats.record_status_change(instance, instance.previous("status"))
+
+
+@receiver(post_delete, sender=Article)
+def remove_from_author_stats(sender, instance, **kwargs):
+    if deleting_in_batch():
+        return
+    author_stats.record_deleted(instance, instance.previous("status") or instance.status)
+
+
+# pre_delete fires before the cascade reaches the author's articles, post_delete after it
+@receiver(pre_delete, sender=User)
+def start_author_delete(sender, instance, **kwargs):
+    author_stats.start_author_delete(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def finish_author_delete(sender, instance, **kwargs):
+    author_stats.finish_author_delete(instance.pk)
+
+
+# Cached closed sitemap shards only go stale when an old published article changes
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_sitemap_archive(sender, instance, **kwargs):
+    if deleting_in_batch():
+        return
+    if (instance.status == "published" or instance.has_changed("status")) and is_archived(instance):
+        bump_fragment_version("sitemap:archive")
+
+
+# The sitemap index only changes when articles join or leave the published set
+@receiver(post_save, sender=Article)
+def invalidate_sitemap_index(sender, instance, created, **kwargs):
+    if (created and instance.status == "published") or instance.has_changed("status"):
+        bump_fragment_version("sitemap")
+
+
+@receiver(post_delete, sender=Article)
+def invalidate_sitemap_index_on_delete(sender, instance, **kwargs):
+    if deleting_in_batch():
+        return
+    if (instance.previous("status") or instance.status) == "published":
+        bump_fragment_version("sitemap")
+
+
+@receiver(post_delete, sender=Category)
+def invalidate_category_sitemap(sender, instance, **kwargs):
+    bump_fragment_version("sitemap:archive")
+    bump_fragment_version("sitemap")
+
+
+@receiver(post_save, sender=Category)
+def invalidate_sitemap_index_on_category(sender, instance, created, **kwargs):
+    if created:
+        bump_fragment_version("sitemap")
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_caches(sender, instance, **kwargs):
+    bump_fragment_version("categories")
+    bump_fragment_version(f"category:{instance.pk}")
+    bump_fragment_version("feed")
+    bump_fragment_version(f"feed:category:{instance.pk}")
+
+
+@receiver(post_save, sender="comments.Comment")
+@receiver(post_delete, sender="comments.Comment")
+def invalidate_comment_caches(sender, instance, **kwargs):
+    bump_fragment_version("articles")
+    bump_fragment_version(f"article:{instance.article_id}")
+
+
+# Build responsive image variants once a new image is saved
+def _invalidate_article_page(pk):
+    bump_fragment_version("articles")
+    bump_fragment_version(f"article:{pk}")
+
+
+@receiver(post_save, sender=Article)
+def build_article_image_variants(sender, instance, **kwargs):
+    schedule_variants(instance, "image", "image_variants", on_done=_invalidate_article_page)
@@ -0,0 +1,169 @@
+import hashlib
+from xml.sax.saxutils import escape
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from news.fragments import get_fragment_version
+from news.models import Article, Category
+
+
+# Sharded sitemaps.
+# /sitemap.xml is an index of shards of at most SHARD_SIZE URLs each. Shards are
+# keyset ranges over (created_at, id) for articles and id for categories, so a
+# shard is found without OFFSET and rows are streamed straight from
+# values_list().iterator(). Shard end keys are remembered in the cache; every
+# shard but the newest is closed and its XML is cached, so normally only the tail
+# is queried. Edits to articles inside closed shards bump "sitemap:archive"
+# (see news/signals.py), which retires the cached closed shards. The index itself
+# is cached briefly under the "sitemap" version, bumped whenever an article enters
+# or leaves the published set, so the tail is only recounted after such a change.
+
+SHARD_SIZE = 10000  # the protocol allows 50,000
+SHARD_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+BOUNDARIES_TIMEOUT = SHARD_CACHE_TIMEOUT  # rebuilt from scratch now and then, healing any drift
+INDEX_CACHE_TIMEOUT = 60 * 15
+CHUNK_SIZE = 2000
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+
+
+def _articles():
+    return Article.objects.filter(status="published")
+
+
+def _article_entry(slug, updated_at):
+    return reverse("news:article_detail", args=[slug]), updated_at
+
+
+def _category_entry(pk):
+    return reverse("news:category_detail", args=[pk]), None
+
+
+SECTIONS = {
+    "articles": {
+        "queryset": _articles,
+        "key": ("created_at", "id"),
+        "values": ("slug", "updated_at"),
+        "entry": _article_entry,
+    },
+    "categories": {
+        "queryset": Category.objects.all,
+        "key": ("id",),
+        "values": ("id",),
+        "entry": _category_entry,
+    },
+}
+
+
+def _keyset(fields, key, lookup):
+    # Lexicographic comparison of `fields` against `key`; lookup is "gt" or "lte"
+    field, rest = fields[0], fields[1:]
+    if not rest:
+        return Q(**{f"{field}__{lookup}": key[0]})
+    strict = "gt" if lookup == "gt" else "lt"
+    return Q(**{f"{field}__{strict}": key[0]}) | (Q(**{field: key[0]}) & _keyset(rest, key[1:], lookup))
+
+
+def _boundaries_key(section):
+    return f"news:sitemap:boundaries:{section}"
+
+
+def get_boundaries(section):
+    """End keys of the closed shards of ``section``, extended over any newly filled shards."""
+    spec = SECTIONS[section]
+    boundaries = cache.get(_boundaries_key(section)) or []
+    rows = spec["queryset"]().order_by(*spec["key"]).values_list(*spec["key"])
+    if boundaries:
+        rows = rows.filter(_keyset(spec["key"], boundaries[-1], "gt"))
+
+    filled = False
+    count = 0
+    for key in rows.iterator(chunk_size=CHUNK_SIZE):
+        count += 1
+        if count == SHARD_SIZE:
+            boundaries.append(key)
+            count = 0
+            filled = True
+    if filled or cache.get(_boundaries_key(section)) is None:
+        cache.set(_boundaries_key(section), boundaries, BOUNDARIES_TIMEOUT)
+    return boundaries
+
+
+def is_archived(article):
+    # True when the article sits in a closed (cached) article shard
+    boundaries = cache.get(_boundaries_key("articles"))
+    return bool(boundaries) and (article.created_at, article.pk) <= tuple(boundaries[-1])
+
+
+def _shard_rows(section, boundaries, number):
+    spec = SECTIONS[section]
+    rows = spec["queryset"]()
+    if number > 0:
+        rows = rows.filter(_keyset(spec["key"], boundaries[number - 1], "gt"))
+    if number < len(boundaries):
+        rows = rows.filter(_keyset(spec["key"], boundaries[number], "lte"))
+    return rows.order_by(*spec["key"]).values_list(*spec["values"]).iterator(chunk_size=CHUNK_SIZE)
+
+
+def _render_shard(request, section, boundaries, number):
+    entry = SECTIONS[section]["entry"]
+    yield XML_HEADER + URLSET_OPEN
+    for values in _shard_rows(section, boundaries, number):
+        path, lastmod = entry(*values)
+        line = f"<url><loc>{escape(request.build_absolute_uri(path))}</loc>"
+        if lastmod:
+            line += f"<lastmod>{lastmod.date().isoformat()}</lastmod>"
+        yield line + "</url>\n"
+    yield "</urlset>\n"
+
+
+def _caching(chunks, key):
+    # Stream to the client and keep a copy for the cache once complete
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    cache.set(key, "".join(parts), SHARD_CACHE_TIMEOUT)
+
+
+def sitemap_index(request):
+    key = f"news:sitemap:index:{request.get_host()}:{get_fragment_version('sitemap')}"
+    cached = cache.get(key)
+    if cached is None:
+        cached = _render_index(request)
+        cache.set(key, cached, INDEX_CACHE_TIMEOUT)
+    return HttpResponse(cached, content_type="application/xml")
+
+
+def _render_index(request):
+    lines = [XML_HEADER, '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+    for section in SECTIONS:
+        for number in range(len(get_boundaries(section)) + 1):
+            location = request.build_absolute_uri(reverse("news:sitemap_shard", args=[section, number]))
+            lines.append(f"<sitemap><loc>{escape(location)}</loc></sitemap>\n")
+    lines.append("</sitemapindex>\n")
+    return "".join(lines)
+
+
+def sitemap_shard(request, section, number):
+    if section not in SECTIONS:
+        raise Http404
+    boundaries = cache.get(_boundaries_key(section))
+    if boundaries is None or number > len(boundaries):
+        boundaries = get_boundaries(section)
+    if number > len(boundaries):
+        raise Http404
+
+    chunks = _render_shard(request, section, boundaries, number)
+    if number < len(boundaries):
+        lo = boundaries[number - 1] if number else None
+        shard = f"{section}|{request.get_host()}|{lo}|{boundaries[number]}|{get_fragment_version('sitemap:archive')}"
+        key = f"news:sitemap:{hashlib.md5(shard.encode()).hexdigest()}"
+        cached = cache.get(key)
+        if cached is not None:
+            return HttpResponse(cached, content_type="application/xml")
+        chunks = _caching(chunks, key)
+    return StreamingHttpResponse(chunks, content_type="application/xml")
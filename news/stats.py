@@ -0,0 +1,52 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, Q
+from news.fragments import bump_fragment_version, get_fragment_version
+from news.models import Article, Category
+
+
+# Dashboard statistics.
+# The admin and editor dashboards render from one snapshot: article totals come
+# from a single conditional aggregate and the per-category breakdown from one
+# grouped query. The snapshot is cached briefly under a version that
+# news/signals.py bumps whenever an article is added, removed or changes status.
+
+STATS_SCOPE = "dashboard_stats"
+STATS_TIMEOUT = 60
+
+
+def compute_dashboard_stats():
+    totals = Article.objects.aggregate(
+        total=Count("id"),
+        pending=Count("id", filter=Q(status="pending")),
+        published=Count("id", filter=Q(status="published")),
+    )
+    categories = list(
+        Category.objects.annotate(
+            total=Count("articles"),
+            published=Count("articles", filter=Q(articles__status="published")),
+        )
+        .order_by("name")
+        .values("id", "name", "total", "published")
+    )
+    return {
+        "total_articles": totals["total"],
+        "pending_articles_count": totals["pending"],
+        "published_articles_count": totals["published"],
+        "categories_count": len(categories),
+        "users_count": User.objects.count(),
+        "categories": categories,
+    }
+
+
+def get_dashboard_stats():
+    key = f"news:dashboard_stats:{get_fragment_version(STATS_SCOPE)}"
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_dashboard_stats()
+        cache.set(key, stats, STATS_TIMEOUT)
+    return stats
+
+
+def invalidate_dashboard_stats():
+    bump_fragment_version(STATS_SCOPE)
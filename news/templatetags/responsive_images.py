@@ -0,0 +1,29 @@
+from django import template
+from django.utils.html import format_html
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, variants, alt="", css_class="", sizes="100vw", eager=False):
+    """<picture> with WebP/JPEG srcsets, intrinsic size and a blurred placeholder; plain <img> until variants exist."""
+    loading = "eager" if eager else "lazy"
+    if not variants or variants.get("source") != image.name:
+        return format_html('<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">', image.url, alt, css_class, loading)
+
+    storage = image.storage
+
+    def srcset(key):
+        return ", ".join(f"{storage.url(name)} {width}w" for width, name in sorted(variants[key].items(), key=lambda item: int(item[0])))
+
+    largest_jpeg = storage.url(max(variants["jpeg"].items(), key=lambda item: int(item[0]))[1])
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" loading="{}" decoding="async" '
+        'style="background-image:url({});background-size:cover">'
+        '</picture>',
+        srcset("webp"), sizes,
+        largest_jpeg, srcset("jpeg"), sizes, variants["width"], variants["height"], alt, css_class, loading,
+        variants["placeholder"],
+    )
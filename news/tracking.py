@@ -0,0 +1,76 @@
+import atexit
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import wraps
+
+from django.db.models import F
+from news.models import Article
+
+
+# View counting and trending.
+# Views are buffered per process and written in batched UPDATEs, so reading an
+# article never costs a write. Trending scores are precomputed by the
+# `update_trending` command; the ranking is read straight from the partial
+# article_trending_idx index, so every worker sees a new run immediately.
+
+FLUSH_INTERVAL = 30  # seconds
+FLUSH_THRESHOLD = 500  # buffered views
+
+TRENDING_WINDOW_DAYS = 7
+TRENDING_GRAVITY = 1.8
+
+_buffer = Counter()
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def record_view(slug):
+    global _last_flush
+    with _lock:
+        _buffer[slug] += 1
+        due = sum(_buffer.values()) >= FLUSH_THRESHOLD or time.monotonic() - _last_flush >= FLUSH_INTERVAL
+    if due:
+        flush_views()
+
+
+def flush_views():
+    global _last_flush
+    with _lock:
+        pending = dict(_buffer)
+        _buffer.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    # One UPDATE per distinct increment rather than one per article
+    by_increment = defaultdict(list)
+    for slug, n in pending.items():
+        by_increment[n].append(slug)
+    for n, slugs in by_increment.items():
+        Article.objects.filter(slug__in=slugs, status="published").update(view_count=F("view_count") + n)
+    return sum(pending.values())
+
+
+atexit.register(flush_views)
+
+
+def count_article_view(view):
+    # Sits outside the page cache so cached hits are still counted
+    @wraps(view)
+    def wrapper(request, slug, *args, **kwargs):
+        if request.method == "GET":
+            record_view(slug)
+        return view(request, slug, *args, **kwargs)
+
+    return wrapper
+
+
+def trending_score(views, age_hours):
+    return views / pow(age_hours + 2, TRENDING_GRAVITY)
+
+
+def get_trending_articles(limit=5):
+    articles = Article.objects.filter(status="published").only("id", "title", "slug")
+    trending = list(articles.filter(trending_score__gt=0).order_by("-trending_score")[:limit])
+    return trending or list(articles.order_by("-created_at", "-id")[:limit])
@@ -2,8 +2,11 @@ from django.urls import path
 from news.views import (
     article_list, article_detail, create_article, update_article, delete_article,
     category_list, category_detail, create_category, update_category,delete_category,
-    review_articles, approve_article, reject_article
+    review_articles, approve_article, reject_article, moderate_articles
 )
+from news.feeds import latest_rss, latest_atom, category_rss, category_atom
+from news.sitemaps import sitemap_index, sitemap_shard
+from news.api import article_list_api, article_detail_api, category_list_api, comment_list_api
 
 
 app_name = "news"
@@ -24,8 +27,25 @@ urlpatterns = [
     path("categories/<int:pk>/update/", update_category, name="update_category"),
     path("categories/<int:pk>/delete/", delete_category, name="delete_category"),
 
+    # Feeds
+    path("feeds/rss/", latest_rss, name="feed_rss"),
+    path("feeds/atom/", latest_atom, name="feed_atom"),
+    path("categories/<int:pk>/feeds/rss/", category_rss, name="category_feed_rss"),
+    path("categories/<int:pk>/feeds/atom/", category_atom, name="category_feed_atom"),
+
+    # Sitemaps
+    path("sitemap.xml", sitemap_index, name="sitemap_index"),
+    path("sitemaps/<str:section>-<int:number>.xml", sitemap_shard, name="sitemap_shard"),
+
+    # JSON API
+    path("api/articles/", article_list_api, name="api_article_list"),
+    path("api/articles/<slug:slug>/", article_detail_api, name="api_article_detail"),
+    path("api/articles/<slug:slug>/comments/", comment_list_api, name="api_comment_list"),
+    path("api/categories/", category_list_api, name="api_category_list"),
+
     # Review and Approve Articles
     path("articles/review/", review_articles, name="review_articles"),
+    path("articles/review/moderate/", moderate_articles, name="moderate_articles"),
     path("approve-article/<int:pk>/", approve_article, name="approve_article"),
     path("reject-article/<int:pk>/", reject_article, name="reject_article"),
 ]
@@ -3,35 +3,50 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from news.models import Article, Category
 from news.forms import AdminArticleForm, ArticleForm, CategoryForm
 from comments.forms import CommentForm
-from django.core.paginator import Paginator
-from django.db.models import Q
+from comments.utils import save_new_comment, get_comment_page
+from news.pagination import KeysetPaginator, RankedPaginator
+from news.search import search_articles
+from news.tracking import get_trending_articles, count_article_view
+from news.page_cache import cache_anonymous_page, depend_on
+from news.related import get_related_articles
+from news.fragments import get_fragment_version
+from news.moderation import MAX_MODERATION_BATCH, approve_articles, reject_articles
+from news.conditional import (
+    article_etag, article_last_modified, article_list_etag, article_list_last_modified,
+    category_etag, category_last_modified, revalidate,
+)
+from functools import partial
 from users.utils import is_admin_editor_reporter,is_admin_or_editor, is_admin, is_editor, is_reporter, is_moderator
 from django.contrib import messages
 from django.urls import reverse
-from django.db.models import Prefetch
+from django.views.decorators.http import condition, require_POST
 
 # Create your views here.
 
 # Article Views
 
+@revalidate
+@condition(etag_func=article_list_etag, last_modified_func=article_list_last_modified)
+@cache_anonymous_page
 def article_list(request):
+    depend_on(request, "articles", "categories", "trending")
     query = request.GET.get("q", "")
-    articles_queryset = Article.objects.filter(status="published").select_related("author", "category").order_by("-created_at")
-    if query:
-        articles_queryset = articles_queryset.filter(Q(title__icontains=query) | Q(content__icontains=query))
+    articles_queryset = Article.objects.filter(status="published").select_related("author", "category").defer("content").order_by("-created_at", "-id")
 
-    articles_list = list(articles_queryset)
-    featured = articles_list[0] if articles_list else None
-    articles_list = articles_list[1:]
+    if query:
+        ranked_ids = search_articles(query)
+        featured = articles_queryset.filter(pk=ranked_ids[0]).first() if ranked_ids else None
+        paginator = RankedPaginator(articles_queryset, ranked_ids[1:], 6)
+    else:
+        featured = articles_queryset.first()
+        page_queryset = articles_queryset.exclude(pk=featured.pk) if featured else articles_queryset
+        paginator = KeysetPaginator(page_queryset, 6)
 
-    paginator = Paginator(articles_list, 6)
-    page_number = request.GET.get("page")
-    articles = paginator.get_page(page_number)
+    articles = paginator.get_page(request.GET.get("cursor"))
 
-    categories = Category.objects.prefetch_related(
-        Prefetch("articles", queryset=Article.objects.filter(status="published"))
-    )
-    trending = articles_queryset[:5]
+    # Sidebar querysets stay lazy; on a fragment cache hit they never run
+    categories = Category.objects.all()
+    trending = partial(get_trending_articles, 5)
 
     return render(request, "articles/article_list.html", {
         "featured": featured,
@@ -39,21 +54,28 @@ def article_list(request):
         "categories": categories,
         "trending": trending,
         "query": query,
+        "categories_version": get_fragment_version("categories"),
+        "trending_version": get_fragment_version("trending"),
     })
 
 
+@count_article_view
+@revalidate
+@condition(etag_func=article_etag, last_modified_func=article_last_modified)
+@cache_anonymous_page
 def article_detail(request, slug):
-    article = get_object_or_404(
-        Article.objects.select_related("author", "category").prefetch_related(
-            Prefetch("comments", queryset=CommentForm.Meta.model.objects.select_related("user").order_by("-created_at"))
-        ),
-        slug=slug, status="published"
-    )
+    article = get_object_or_404(Article.objects.select_related("author", "category"), slug=slug, status="published")
+
+    depend_on(request, f"article:{article.pk}", f"category:{article.category_id}", "related")
 
     comment_form = CommentForm()
-    related = Article.objects.filter(
-        category=article.category, status="published"
-    ).exclude(id=article.id).select_related("author")[:5]
+    comments = get_comment_page(article, request.GET.get("comments"))
+    related = get_related_articles(article, 5)
+    if not related:
+        # Not indexed yet; fall back to the newest stories in the same category
+        related = Article.objects.filter(
+            category=article.category, status="published"
+        ).exclude(id=article.id).select_related("author").defer("content")[:5]
 
     if request.method == "POST" and request.user.is_authenticated:
         comment_form = CommentForm(request.POST)
@@ -61,12 +83,13 @@ def article_detail(request, slug):
             comment = comment_form.save(commit=False)
             comment.user = request.user
             comment.article = article
-            comment.save()
+            save_new_comment(comment)
             return redirect("news:article_detail", slug=slug)
 
     return render(request, "articles/article_detail.html", {
         "article": article,
         "comment_form": comment_form,
+        "comments": comments,
         "related": related,
     })
 
@@ -155,8 +178,12 @@ def delete_article(request, slug):
 @user_passes_test(is_admin_or_editor, login_url='users:no_permission')
 def review_articles(request):
     # Only allow Admins and Editors
-    pending_articles = Article.objects.filter(status="pending").select_related('author', 'category').order_by('-created_at')
-    published_articles = Article.objects.filter(status="published").select_related('author', 'category').order_by('-created_at')
+    pending_articles = KeysetPaginator(
+        Article.objects.filter(status="pending").select_related('author', 'category').defer("content"), 20
+    ).get_page(request.GET.get("pending"))
+    published_articles = KeysetPaginator(
+        Article.objects.filter(status="published").select_related('author', 'category').defer("content"), 20
+    ).get_page(request.GET.get("published"))
 
     return render(request, "articles/review_articles.html", {
         "pending_articles": pending_articles,
@@ -165,28 +192,56 @@ def review_articles(request):
 
 
 
+def _dashboard_redirect(user):
+    if is_admin(user):
+        return redirect(reverse("users:admin_dashboard"))
+    elif is_editor(user):
+        return redirect(reverse("users:editor_dashboard"))
+
+
 @login_required
 @user_passes_test(is_admin_or_editor, login_url='users:no_permission')
+@require_POST
+def moderate_articles(request):
+    # Bulk approve/reject from the review queue; only rows still pending transition
+    ids = [pk for pk in request.POST.getlist("ids") if pk.isdigit()][:MAX_MODERATION_BATCH]
+    action = request.POST.get("action")
+    if action not in ("approve", "reject") or not ids:
+        messages.error(request, "Select at least one article and an action.")
+        return redirect("news:review_articles")
+
+    moderate = approve_articles if action == "approve" else reject_articles
+    done = moderate(ids)
+    skipped = len(ids) - len(done)
+    verb = "approved and published" if action == "approve" else "rejected and deleted"
+    if done:
+        messages.success(request, f"{len(done)} article(s) {verb}.")
+    if skipped:
+        messages.info(request, f"{skipped} article(s) were already handled by someone else.")
+    return redirect("news:review_articles")
+
+
+@login_required
+@user_passes_test(is_admin_or_editor, login_url='users:no_permission')
+@require_POST
 def approve_article(request, pk):
-    article = get_object_or_404(Article, pk=pk, status="pending")
-    article.status = "published"
-    article.save()
-    messages.success(request, f"Article '{article.title}' has been approved and published.")
-    if is_admin(request.user):
-        return redirect(reverse("users:admin_dashboard"))
-    elif is_editor(request.user):
-        return redirect(reverse("users:editor_dashboard"))
+    done = approve_articles([pk])
+    if done:
+        messages.success(request, f"Article '{done[0].title}' has been approved and published.")
+    else:
+        messages.info(request, "That article is no longer pending.")
+    return _dashboard_redirect(request.user)
 
 @login_required
 @user_passes_test(is_admin_or_editor, login_url='users:no_permission')
+@require_POST
 def reject_article(request, pk):
-    article = get_object_or_404(Article, pk=pk, status="pending")
-    article.delete()
-    messages.warning(request, f"Article '{article.title}' has been rejected and deleted.")
-    if is_admin(request.user):
-        return redirect(reverse("users:admin_dashboard"))
-    elif is_editor(request.user):
-        return redirect(reverse("users:editor_dashboard"))
+    done = reject_articles([pk])
+    if done:
+        messages.warning(request, f"Article '{done[0].title}' has been rejected and deleted.")
+    else:
+        messages.info(request, "That article is no longer pending.")
+    return _dashboard_redirect(request.user)
 
 
 
@@ -197,9 +252,13 @@ def category_list(request):
     return render(request, "categories/category_list.html", {"categories": categories})
 
 
+@revalidate
+@condition(etag_func=category_etag, last_modified_func=category_last_modified)
 def category_detail(request, pk):
     category = get_object_or_404(Category, pk=pk)
-    articles = Article.objects.filter(category=category, status="published").order_by("-created_at")
+    articles = KeysetPaginator(
+        Article.objects.filter(category=category, status="published").defer("content"), 12
+    ).get_page(request.GET.get("cursor"))
     return render(request, "categories/category_detail.html", {"category": category, "articles": articles})
 
 
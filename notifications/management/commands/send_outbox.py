@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from notifications.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails in batches over one reused mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--sleep", type=float, default=5, help="Seconds to wait when the outbox is empty.")
+        parser.add_argument("--once", action="store_true", help="Drain the outbox and exit instead of polling.")
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = send_pending(options["batch_size"])
+            except Exception as e:
+                # Keep the worker alive through database hiccups; the rows stay queued
+                if options["once"]:
+                    raise
+                self.stderr.write(f"Outbox batch failed: {e}")
+                close_old_connections()
+                time.sleep(options["sleep"])
+                continue
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}.")
+            elif options["once"]:
+                break
+            else:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS("Outbox drained."))
@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+from notifications.models import OutboxEmail
+
+
+# Outgoing mail goes through the OutboxEmail table instead of a synchronous SMTP
+# call. Rows are written once the surrounding transaction commits and are sent
+# by `manage.py send_outbox`, which claims a batch in a short transaction and
+# talks to the mail server outside it.
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 60  # seconds; doubles after every failed attempt
+BACKOFF_MAX = 6 * 60 * 60
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def enqueue_email(subject, message, recipient_list, from_email=None, html_message=None):
+    recipients = [address for address in recipient_list if address]
+    if not recipients:
+        return
+
+    def write():
+        OutboxEmail.objects.create(
+            subject=subject,
+            body=message,
+            html_body=html_message or "",
+            from_email=from_email or settings.EMAIL_HOST_USER,
+            recipients=recipients,
+        )
+
+    transaction.on_commit(write)
+
+
+def enqueue_bulk(emails, from_email=None, batch_size=1000):
+    """Queue many ``(subject, message, recipient_list)`` emails with bulk inserts."""
+    rows = [
+        OutboxEmail(
+            subject=subject,
+            body=message,
+            from_email=from_email or settings.EMAIL_HOST_USER,
+            recipients=[address for address in recipient_list if address],
+        )
+        for subject, message, recipient_list in emails
+    ]
+    rows = [row for row in rows if row.recipients]
+    transaction.on_commit(lambda: OutboxEmail.objects.bulk_create(rows, batch_size=batch_size))
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX))
+
+
+def _build_message(email, connection):
+    message = EmailMultiAlternatives(
+        email.subject, email.body, email.from_email or None, email.recipients, connection=connection
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def _record_failure(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= MAX_ATTEMPTS:
+        email.status = "dead"
+    else:
+        email.next_attempt_at = timezone.now() + backoff(email.attempts)
+
+
+def _claim(batch_size):
+    # Short transaction: lock due rows and push them out of reach of other workers
+    # for CLAIM_TIMEOUT, so no row lock is held while talking to the mail server.
+    # If this worker dies mid-batch its rows become due again once the claim lapses.
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if batch:
+            OutboxEmail.objects.filter(pk__in=[email.pk for email in batch]).update(next_attempt_at=now + CLAIM_TIMEOUT)
+    return batch
+
+
+def send_pending(batch_size=100):
+    """Send one batch of due emails over a single connection. Returns (sent, failed)."""
+    batch = _claim(batch_size)
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # Mail server unreachable: the whole batch counts as one failed attempt
+        for email in batch:
+            _record_failure(email, e)
+        failed = len(batch)
+    else:
+        try:
+            for email in batch:
+                try:
+                    connection.send_messages([_build_message(email, connection)])
+                except Exception as e:
+                    _record_failure(email, e)
+                    failed += 1
+                else:
+                    email.status = "sent"
+                    email.sent_at = timezone.now()
+                    email.last_error = ""
+                    sent += 1
+        finally:
+            connection.close()
+
+    OutboxEmail.objects.bulk_update(batch, ["status", "attempts", "next_attempt_at", "last_error", "sent_at"])
+    return sent, failed
@@ -3,7 +3,9 @@ from phonenumber_field.formfields import PhoneNumberField as PhoneNumberFormFiel
 from django.contrib.auth.models import Group
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
-from django.contrib.auth.forms import PasswordChangeForm
+from django.contrib.auth.forms import PasswordChangeForm, PasswordResetForm
+from django.template import loader
+from notifications.outbox import enqueue_email
 from django.core.exceptions import ValidationError
 from users.models import Profile
 
@@ -96,4 +98,13 @@ class CustomPasswordChangeForm(PasswordChangeForm):
         widget=forms.PasswordInput(attrs={
             'placeholder': 'Enter your new password again'
         })
-    )
\ No newline at end of file
+    )
+
+
+class OutboxPasswordResetForm(PasswordResetForm):
+    # Queue reset emails through the outbox instead of sending them inline
+    def send_mail(self, subject_template_name, email_template_name, context, from_email, to_email, html_email_template_name=None):
+        subject = "".join(loader.render_to_string(subject_template_name, context).splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        html_body = loader.render_to_string(html_email_template_name, context) if html_email_template_name else None
+        enqueue_email(subject, body, [to_email], from_email, html_body)
@@ -0,0 +1,138 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models.functions import Lower
+from notifications.outbox import enqueue_bulk
+from users.models import Profile
+from users.signals import build_activation_email
+
+
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create users from a CSV or JSONL file. Columns: username, email, first_name, last_name, "
+        "password, role, is_active. Bypasses the per-user post_save signals and queues activation "
+        "emails in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--default-role", default="Subscriber")
+        parser.add_argument("--no-activation-email", action="store_true", help="Don't queue activation emails for inactive users.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+        fmt = options["format"] or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+
+        self.default_role = options["default_role"]
+        self.send_activation = not options["no_activation_email"]
+        self.groups = {}
+
+        created = skipped = 0
+        started = time.monotonic()
+        with path.open(newline="", encoding="utf-8") as f:
+            records = self.read_records(f, fmt)
+            while True:
+                chunk = list(islice(records, options["chunk_size"]))
+                if not chunk:
+                    break
+                new, dupes = self.import_chunk(chunk)
+                created += new
+                skipped += dupes
+                self.stdout.write(f"{created} created, {skipped} skipped ({created / max(time.monotonic() - started, 1e-6):.0f} users/s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} users, skipped {skipped}."))
+
+    def read_records(self, f, fmt):
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def get_group(self, name):
+        if name not in self.groups:
+            self.groups[name], _ = Group.objects.get_or_create(name=name)
+        return self.groups[name]
+
+    def import_chunk(self, records):
+        # Usernames are kept as given; duplicates, against existing accounts or
+        # within the file, are matched case-insensitively through the LOWER()
+        # indexes from users/migrations/0011_user_directory_indexes.py
+        usernames = {(r.get("username") or r.get("email") or "").strip().lower() for r in records}
+        emails = {(r.get("email") or "").strip().lower() for r in records} - {""}
+        taken_usernames = set(
+            User.objects.annotate(key=Lower("username")).filter(key__in=usernames).values_list("key", flat=True)
+        )
+        taken_emails = set(
+            User.objects.annotate(key=Lower("email")).filter(key__in=emails).values_list("key", flat=True)
+        )
+
+        users, roles = [], {}
+        for record in records:
+            username = (record.get("username") or record.get("email") or "").strip()
+            email = (record.get("email") or "").strip()
+            if not username or username.lower() in taken_usernames or (email and email.lower() in taken_emails):
+                continue
+            role = record.get("role")
+            role = self.default_role if role is None else role.strip()
+            if not role:
+                self.stderr.write(f"Skipping {username}: blank role.")
+                continue
+            taken_usernames.add(username.lower())
+            if email:
+                taken_emails.add(email.lower())
+
+            user = User(
+                username=username,
+                email=email,
+                first_name=record.get("first_name") or "",
+                last_name=record.get("last_name") or "",
+                is_active=str(record.get("is_active", "")).strip().lower() in TRUE_VALUES,
+            )
+            if record.get("password"):
+                user.password = make_password(record["password"])
+            else:
+                user.set_unusable_password()
+            users.append(user)
+            roles[username] = role
+
+        if not users:
+            return 0, len(records)
+
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            if any(user.pk is None for user in users):
+                ids = dict(User.objects.filter(username__in=roles).values_list("username", "id"))
+                for user in users:
+                    user.pk = ids[user.username]
+
+            Profile.objects.bulk_create([Profile(user_id=user.pk) for user in users])
+            Membership = User.groups.through
+            Membership.objects.bulk_create([
+                Membership(user_id=user.pk, group_id=self.get_group(roles[user.username]).pk)
+                for user in users
+            ])
+
+            if self.send_activation:
+                enqueue_bulk(
+                    (build_activation_email(user) for user in users if not user.is_active),
+                    settings.EMAIL_HOST_USER,
+                )
+
+        return len(users), len(records) - len(users)
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+# auth_user belongs to django.contrib.auth, so the directory's search indexes
+# are created here with plain SQL (see users.utils.search_users)
+INDEXES = {
+    "users_username_lower_idx": "LOWER(username)",
+    "users_email_lower_idx": "LOWER(email)",
+}
+
+
+def create_indexes(apps, schema_editor):
+    for name, expression in INDEXES.items():
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON auth_user ({expression})")
+
+
+def drop_indexes(apps, schema_editor):
+    for name in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0010_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
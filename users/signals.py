@@ -1,27 +1,29 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.contrib.auth.models import User, Group
 from django.dispatch import receiver
 from django.contrib.auth.tokens import default_token_generator
 from django.conf import settings
-from django.core.mail import send_mail
-from django.http import HttpResponse
+from notifications.outbox import enqueue_email
 from users.models import Profile
+from users.utils import invalidate_user_roles, invalidate_all_roles
+from news.images import schedule_variants
+from news.stats import invalidate_dashboard_stats
+
+
+def build_activation_email(user):
+    token = default_token_generator.make_token(user)
+    activation_url = f"{settings.FRONTEND_URL}/users/activate/{user.id}/{token}/"
+    subject = 'Activate Your Account'
+    message = f'Hi {user.username},\n\nPlease activate your account by clicking the link below:\n{activation_url}\n\nThank You!'
+    return subject, message, [user.email]
 
 
 # Send activation email to new users
 @receiver(post_save, sender=User)
 def send_activation_email(sender, instance, created, **kwargs):
     if created:
-        token = default_token_generator.make_token(instance)
-        activation_url = f"{settings.FRONTEND_URL}/users/activate/{instance.id}/{token}/"
-        subject = 'Activate Your Account'
-        message = f'Hi {instance.username},\n\nPlease activate your account by clicking the link below:\n{activation_url}\n\nThank You!'
-        recipient_list = [instance.email]
-
-        try:
-            send_mail(subject, message, settings.EMAIL_HOST_USER, recipient_list)
-        except Exception as e:
-            return HttpResponse(f"Failed to send email to {instance.email}: {str(e)}")
+        subject, message, recipient_list = build_activation_email(instance)
+        enqueue_email(subject, message, recipient_list, settings.EMAIL_HOST_USER)
         
 
 # Create or update user profile
@@ -43,3 +45,40 @@ def assign_role(sender, instance, created, **kwargs):
         else:
             subscriber_group, _ = Group.objects.get_or_create(name='Subscriber')
             instance.groups.add(subscriber_group)
+
+
+# Drop cached role names whenever group membership or group names change
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roles_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        invalidate_user_roles(instance.pk)
+    elif pk_set:
+        invalidate_user_roles(*pk_set)
+    else:
+        invalidate_all_roles()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_roles_on_group_change(sender, **kwargs):
+    invalidate_all_roles()
+
+
+# Build responsive avatar variants once a new profile image is saved
+@receiver(post_save, sender=Profile)
+def build_profile_image_variants(sender, instance, **kwargs):
+    schedule_variants(instance, "profile_image", "profile_image_variants")
+
+
+# Keep the dashboard user count current
+@receiver(post_save, sender=User)
+def invalidate_stats_on_signup(sender, instance, created, **kwargs):
+    if created:
+        invalidate_dashboard_stats()
+
+
+@receiver(post_delete, sender=User)
+def invalidate_stats_on_user_delete(sender, **kwargs):
+    invalidate_dashboard_stats()
@@ -1,13 +1,14 @@
 from django.urls import path
 from users.views import (
     signup_view, login_view, logout_view, activate_user,
-    admin_dashboard, editor_dashboard, reporter_dashboard,
+    admin_dashboard, editor_dashboard, reporter_dashboard, dashboard_section,
     assign_role, group_create, group_list, group_edit, group_delete,
     user_list, edit_user_roles, ProfileView, edit_profile,
     ChangePassword, CustomPasswordChangeDoneView, no_permission
 )
 from django.contrib.auth import views as auth_views
 from django.urls import reverse_lazy
+from users.forms import OutboxPasswordResetForm
 
 app_name = "users"
 
@@ -22,6 +23,7 @@ urlpatterns = [
     path("admin/", admin_dashboard, name="admin_dashboard"),
     path("editor/", editor_dashboard, name="editor_dashboard"),
     path("reporter/", reporter_dashboard, name="reporter_dashboard"),
+    path("dashboard/sections/<str:section>/", dashboard_section, name="dashboard_section"),
 
     # ---------------- User & Group Management ----------------
     path("assign_role/<int:user_id>/", assign_role, name="assign_role"),
@@ -50,6 +52,7 @@ urlpatterns = [
         auth_views.PasswordResetView.as_view(
             template_name="users/password_reset_form.html",
             email_template_name="users/password_reset_email.html",
+            form_class=OutboxPasswordResetForm,
             success_url=reverse_lazy("users:password_reset_done"),
         ),
         name="password_reset",
@@ -1,9 +1,55 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.functions import Lower
 
 User = get_user_model()
 
+
+ROLE_CACHE_TIMEOUT = 300
+ROLE_VERSION_KEY = "users:roles_version"
+
+
+# Group names are loaded once per request (memoised on request.user) and shared
+# across requests through the cache, keyed by user pk. The cache is shared by all
+# workers (see CACHES in settings), so the invalidation in users/signals.py, run
+# whenever a membership changes (assign_role, edit_user_roles, the admin) or a
+# group is renamed or deleted, takes effect everywhere on the next request.
+
+def _role_cache_key(user_id):
+    version = cache.get_or_set(ROLE_VERSION_KEY, 1, None)
+    return f"users:roles:{version}:{user_id}"
+
+
+def get_role_names(user):
+    if not user.is_authenticated:
+        return frozenset()
+
+    names = getattr(user, "_role_names", None)
+    if names is None:
+        key = _role_cache_key(user.pk)
+        names = cache.get(key)
+        if names is None:
+            names = frozenset(user.groups.values_list("name", flat=True))
+            cache.set(key, names, ROLE_CACHE_TIMEOUT)
+        user._role_names = names
+    return names
+
+
+def invalidate_user_roles(*user_ids):
+    cache.delete_many([_role_cache_key(user_id) for user_id in user_ids])
+
+
+def invalidate_all_roles():
+    # Group renamed or deleted: orphan every cached entry at once
+    try:
+        cache.incr(ROLE_VERSION_KEY)
+    except ValueError:
+        cache.set(ROLE_VERSION_KEY, 2, None)
+
+
 def user_has_role(user, role_name):
-    return user.groups.filter(name=role_name).exists()
+    return role_name in get_role_names(user)
 
 def is_admin_editor_reporter(user):
     return is_admin(user) or is_editor(user) or is_reporter(user)
@@ -12,19 +58,19 @@ def is_admin_or_editor(user):
     return is_admin(user) or is_editor(user)
 
 def is_admin(user):
-    return user.is_authenticated and user.groups.filter(name="Admin").exists()
+    return user_has_role(user, "Admin")
 
 def is_editor(user):
-    return user.is_authenticated and user.groups.filter(name="Editor").exists()
+    return user_has_role(user, "Editor")
 
 def is_reporter(user):
-    return user.is_authenticated and user.groups.filter(name="Reporter").exists()
+    return user_has_role(user, "Reporter")
 
 def is_moderator(user):
-    return user.is_authenticated and user.groups.filter(name="Moderator").exists()
+    return user_has_role(user, "Moderator")
 
 def is_subscriber(user):
-    return user.is_authenticated and user.groups.filter(name="Subscriber").exists()
+    return user_has_role(user, "Subscriber")
 
 def is_guest(user):
     return not user.is_authenticated
@@ -36,15 +82,22 @@ def get_user_role(request):
     if not user.is_authenticated:
         return None
 
-    if is_admin(user):
-        return "Admin"
-    elif is_editor(user):
-        return "Editor"
-    elif is_reporter(user):
-        return "Reporter"
-    elif is_moderator(user):
-        return "Moderator"
-    elif is_subscriber(user):
-        return "Subscriber"
-    else:
-        return "User"
+    for role in ("Admin", "Editor", "Reporter", "Moderator", "Subscriber"):
+        if user_has_role(user, role):
+            return role
+    return "User"
+
+
+# User directory search.
+# A case-insensitive prefix match written as a range on LOWER(column), so it can use
+# the expression indexes from users/migrations/0011_user_directory_indexes.py on
+# any collation instead of scanning auth_user.
+
+def search_users(queryset, query):
+    prefix = query.strip().lower()
+    if not prefix:
+        return queryset
+    upper = prefix + "\uffff"
+    return queryset.alias(username_lower=Lower("username"), email_lower=Lower("email")).filter(
+        Q(username_lower__gte=prefix, username_lower__lt=upper) | Q(email_lower__gte=prefix, email_lower__lt=upper)
+    )
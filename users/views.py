@@ -1,4 +1,4 @@
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib.auth import login, logout
 from django.contrib.auth.forms import AuthenticationForm
@@ -7,14 +7,17 @@ from users.forms import EditUserForm, GroupForm, RegisterForm, User, AssignRoleF
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
-from users.utils import is_admin, is_editor, is_reporter
-from news.models import Article, Category
+from users.utils import is_admin, is_admin_or_editor, is_editor, is_reporter
+from news.models import Article
 from users.models import Profile
-from django.contrib.auth.models import Group, User, Permission
+from django.contrib.auth.models import Group, User
 from users.decorators import logout_required
 from django.contrib.auth.views import PasswordChangeView, PasswordChangeDoneView
 from django.views.generic import DetailView
-from users.utils import get_user_role
+from users.utils import get_user_role, search_users
+from news.pagination import KeysetPaginator
+from news.stats import get_dashboard_stats
+from news.author_stats import get_author_stats
 
 
 # Create your views here.
@@ -75,51 +78,66 @@ def activate_user(request, user_id, token):
 @login_required
 @user_passes_test(is_admin, login_url='users:no_permission')
 def admin_dashboard(request):
-    # Article stats
-    total_articles = Article.objects.count()
-    pending_articles = Article.objects.filter(status="pending")
-    published_articles = Article.objects.filter(status="published")
-    categories_count = Category.objects.count()
-    users_count = User.objects.count()
-
-    # Articles per category
-    category_articles = {c.name: c.articles.count() for c in Category.objects.all()}
-
-    # Role/Group management
-    groups = Group.objects.prefetch_related("permissions").all()
-    users = User.objects.all()
-
+    # Only the shell and the cached stats; each section loads from dashboard_section
+    stats = get_dashboard_stats()
     context = {
-        "total_articles": total_articles,
-        "pending_articles_count": pending_articles.count(),
-        "published_articles_count": published_articles.count(),
-        "categories_count": categories_count,
-        "users_count": users_count,
-        "pending_articles": pending_articles,
-        "published_articles": published_articles,
-        "category_articles": category_articles,
-        "groups": groups,
-        "users": users,
-        "permissions": Permission.objects.all(),
+        **stats,
+        "category_articles": {c["name"]: c["total"] for c in stats["categories"]},
     }
     return render(request, "users/admin_dashboard.html", context)
 
 
+# Lazily loaded, keyset-paginated dashboard sections
+DASHBOARD_SECTIONS = {
+    "pending": {
+        "queryset": lambda: Article.objects.filter(status="pending").select_related("author").defer("content"),
+        "ordering": ("-created_at", "-id"),
+        "template": "users/dashboard/_pending_articles.html",
+        "allowed": is_admin_or_editor,
+    },
+    "published": {
+        "queryset": lambda: Article.objects.filter(status="published").select_related("author").defer("content"),
+        "ordering": ("-created_at", "-id"),
+        "template": "users/dashboard/_published_articles.html",
+        "allowed": is_admin_or_editor,
+    },
+    "groups": {
+        "queryset": lambda: Group.objects.prefetch_related("permissions"),
+        "ordering": ("name",),
+        "template": "users/dashboard/_groups.html",
+        "allowed": is_admin,
+    },
+    "users": {
+        "queryset": lambda: User.objects.prefetch_related("groups"),
+        "ordering": ("username",),
+        "template": "users/dashboard/_users.html",
+        "allowed": is_admin,
+    },
+}
+DASHBOARD_SECTION_SIZE = 25
+
+
+@login_required
+def dashboard_section(request, section):
+    spec = DASHBOARD_SECTIONS.get(section)
+    if spec is None:
+        raise Http404
+    if not spec["allowed"](request.user):
+        return redirect("users:no_permission")
+    page = KeysetPaginator(spec["queryset"](), DASHBOARD_SECTION_SIZE, spec["ordering"]).get_page(request.GET.get("cursor"))
+    return render(request, spec["template"], {"page": page, "section": section})
+
+
 
 # ---------------- Editor Dashboard ----------------
 @login_required
 @user_passes_test(is_editor, login_url='users:no_permission')
 def editor_dashboard(request):
-    total_articles = Article.objects.count()
-    pending_articles = Article.objects.filter(status="pending")
-    published_articles = Article.objects.filter(status="published")
-
+    stats = get_dashboard_stats()
     context = {
-        "total_articles": total_articles,
-        "pending_articles_count": pending_articles.count(),
-        "published_articles_count": published_articles.count(),
-        "pending_articles": pending_articles,
-        "published_articles": published_articles,
+        "total_articles": stats["total_articles"],
+        "pending_articles_count": stats["pending_articles_count"],
+        "published_articles_count": stats["published_articles_count"],
     }
     return render(request, "users/editor_dashboard.html", context)
 
@@ -128,15 +146,15 @@ def editor_dashboard(request):
 @login_required
 @user_passes_test(is_reporter, login_url='users:no_permission')
 def reporter_dashboard(request):
-    my_articles = Article.objects.filter(author=request.user)
-    my_pending = my_articles.filter(status="pending")
-    my_published = my_articles.filter(status="published")
+    stats = get_author_stats(request.user)
+    my_articles = Article.objects.filter(author=request.user).select_related("category").defer("content")
 
     context = {
-        "my_articles": my_articles,
-        "my_articles_count": my_articles.count(),
-        "my_pending_count": my_pending.count(),
-        "my_published_count": my_published.count(),
+        "my_articles": KeysetPaginator(my_articles, 20).get_page(request.GET.get("cursor")),
+        "my_articles_count": stats.total,
+        "my_pending_count": stats.pending,
+        "my_published_count": stats.published,
+        "last_published_at": stats.last_published_at,
     }
     return render(request, "users/reporter_dashboard.html", context)
 
@@ -163,11 +181,26 @@ def assign_role(request, user_id):
 
 # user management views
 
+USER_DIRECTORY_PAGE_SIZE = 50
+
+
 @login_required
 @user_passes_test(is_admin, login_url='users:no_permission')
 def user_list(request):
-    users = User.objects.all()
-    return render(request, "users/user_list.html", {"users": users})
+    query = request.GET.get("q", "").strip()
+    role = request.GET.get("role", "")
+
+    users = search_users(User.objects.prefetch_related("groups"), query)
+    if role:
+        users = users.filter(groups__name=role)
+
+    context = {
+        "users": KeysetPaginator(users, USER_DIRECTORY_PAGE_SIZE, ("username",)).get_page(request.GET.get("cursor")),
+        "query": query,
+        "role": role,
+        "roles": Group.objects.order_by("name").values_list("name", flat=True),
+    }
+    return render(request, "users/user_list.html", context)
 
 
 @login_required